@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from pipeline import OSINTTools, investigate
+from results import to_jsonable
+
+INPUT_FIELDS = ("ip", "domain", "email", "username")
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class Job:
+    """One queued investigation and the results it has produced so far."""
+    def __init__(self, params, deadline):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.deadline = deadline
+        self.status = QUEUED
+        self.error = None
+        self.events = []
+        self.created = time.time()
+        self.finished = None
+        self.task = None
+        self.tools = None
+        self.cancel_requested = False
+        self._condition = asyncio.Condition()
+
+    async def publish(self, event):
+        async with self._condition:
+            self.events.append(event)
+            self._condition.notify_all()
+
+    async def finish(self, status, error=None):
+        async with self._condition:
+            self.status = status
+            self.error = error
+            self.finished = time.time()
+            self._condition.notify_all()
+
+    async def follow(self):
+        """Yield every event of the job, waiting for new ones until it finishes."""
+        index = 0
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: len(self.events) > index or self.finished is not None)
+                new_events = self.events[index:]
+                finished = self.finished is not None
+            index += len(new_events)
+            for event in new_events:
+                yield event
+            if finished and index >= len(self.events):
+                return
+
+    def summary(self):
+        return {"job_id": self.id, "status": self.status, "params": self.params, "error": self.error,
+                "created": self.created, "finished": self.finished, "results": len(self.events),
+                "single_flight": self.tools.flight.stats() if self.tools else {},
+                "skipped": self.tools.resilience.skipped if self.tools else []}
+
+class InvestigationService:
+    """Queue investigation jobs and run them on a pool of async workers sharing one OSINTTools.
+
+    Blocking lookups run on a shared thread pool sized for network-bound work.
+    Finished jobs are kept (oldest evicted first) so clients can fetch or
+    replay their results, and the shared single-flight cache is cleared every
+    cache_ttl seconds so results do not go stale.
+    """
+    def __init__(self, tools=None, workers=8, queue_size=1000, threads=64, max_jobs=10000,
+                 default_deadline=120, max_deadline=900, cache_ttl=300):
+        self.tools = tools
+        self.workers = workers
+        self.queue_size = queue_size
+        self.threads = threads
+        self.max_jobs = max_jobs
+        self.default_deadline = default_deadline
+        self.max_deadline = max_deadline
+        self.cache_ttl = cache_ttl
+        self.jobs = OrderedDict()
+        self.queue = None
+        self._tasks = []
+
+    async def start(self, app=None):
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=self.threads))
+        if self.tools is None:
+            self.tools = await asyncio.to_thread(OSINTTools.from_config)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._expire_cache()))
+
+    async def stop(self, app=None):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.tools:
+            await asyncio.to_thread(self.tools.close)
+
+    def submit(self, params, deadline=None):
+        """Queue a job; raises asyncio.QueueFull when the service is saturated."""
+        job = Job(params, min(deadline or self.default_deadline, self.max_deadline))
+        self.queue.put_nowait(job)
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.max_jobs:
+            oldest_id, oldest = next(iter(self.jobs.items()))
+            if oldest.finished is None:
+                break
+            del self.jobs[oldest_id]
+        return job
+
+    async def cancel(self, job):
+        if job.finished is not None:
+            return
+        job.cancel_requested = True
+        if job.task:
+            job.task.cancel()
+        else:
+            await job.finish(CANCELLED)
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.finished is not None:
+                    continue
+                job.task = asyncio.create_task(self._run(job))
+                try:
+                    await job.task
+                except asyncio.CancelledError:
+                    if not job.cancel_requested:
+                        raise
+                    await job.finish(CANCELLED)
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, job):
+        job.status = RUNNING
+        job.tools = self.tools.for_run(job.deadline)
+        results = investigate(job.tools, deadline=job.deadline, **job.params)
+        try:
+            async for label, result in results:
+                await job.publish({"label": label, "result": result})
+        except Exception as e:
+            await job.finish(FAILED, f"Error: {e}")
+            return
+        finally:
+            # Cancels the lookups still running when the job is cancelled or fails
+            await results.aclose()
+        await job.finish(DONE)
+
+    async def _expire_cache(self):
+        while True:
+            await asyncio.sleep(self.cache_ttl)
+            self.tools.flight.reset()
+
+    def status(self):
+        running = sum(job.status == RUNNING for job in self.jobs.values())
+        return {
+            "workers": self.workers,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "running": running,
+            "jobs": len(self.jobs),
+            "single_flight": self.tools.flight.stats() if self.tools else {},
+            "providers": self.tools.resilience.status() if self.tools else {}
+        }
+
+def _json(data, status=200):
+    return web.json_response(data, status=status, dumps=lambda value: json.dumps(value, default=to_jsonable))
+
+def create_app(service=None):
+    """Build the aiohttp application serving the investigation API."""
+    service = service if service else InvestigationService()
+    routes = web.RouteTableDef()
+
+    @routes.post("/jobs")
+    async def submit_job(request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return _json({"error": "Body must be a JSON object."}, 400)
+        if not isinstance(body, dict):
+            return _json({"error": "Body must be a JSON object."}, 400)
+        params = {field: str(body[field]).strip() for field in INPUT_FIELDS if body.get(field)}
+        if not params:
+            return _json({"error": f"Provide at least one of: {', '.join(INPUT_FIELDS)}."}, 400)
+        deadline = body.get("deadline")
+        if deadline is not None and (not isinstance(deadline, (int, float)) or deadline <= 0):
+            return _json({"error": "deadline must be a positive number of seconds."}, 400)
+        try:
+            job = service.submit(params, deadline)
+        except asyncio.QueueFull:
+            return _json({"error": "Job queue is full, try again later."}, 503)
+        return _json(job.summary(), 202)
+
+    def find_job(request):
+        job = service.jobs.get(request.match_info["job_id"])
+        if job is None:
+            raise web.HTTPNotFound(text=json.dumps({"error": "Unknown job."}), content_type="application/json")
+        return job
+
+    @routes.get("/jobs/{job_id}")
+    async def get_job(request):
+        job = find_job(request)
+        return _json({**job.summary(), "events": job.events})
+
+    @routes.get("/jobs/{job_id}/stream")
+    async def stream_job(request):
+        """Stream the job's results as newline-delimited JSON, ending with a summary line."""
+        job = find_job(request)
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        async for event in job.follow():
+            await response.write(json.dumps(event, default=to_jsonable).encode("utf-8") + b"\n")
+        summary = {**job.summary(), "event": "end"}
+        await response.write(json.dumps(summary).encode("utf-8") + b"\n")
+        await response.write_eof()
+        return response
+
+    @routes.delete("/jobs/{job_id}")
+    async def cancel_job(request):
+        job = find_job(request)
+        await service.cancel(job)
+        return _json(job.summary())
+
+    @routes.get("/health")
+    async def health(request):
+        return _json(service.status())
+
+    app = web.Application()
+    app.add_routes(routes)
+    app.on_startup.append(service.start)
+    app.on_cleanup.append(service.stop)
+    app["service"] = service
+    return app
+
+# Example Usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AutoIntelX investigation API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=8, help="jobs run concurrently")
+    parser.add_argument("--threads", type=int, default=64, help="threads for blocking lookups")
+    args = parser.parse_args()
+    web.run_app(create_app(InvestigationService(workers=args.workers, threads=args.threads)),
+                host=args.host, port=args.port)
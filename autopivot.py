@@ -0,0 +1,282 @@
+import asyncio
+import heapq
+import ipaddress
+import itertools
+import re
+import time
+from results import LookupResult, to_result, ERROR, SKIPPED
+from resilience import Deadline
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
+DOMAIN_PATTERN = re.compile(r'^(?=.{1,253}$)([a-zA-Z0-9-]{1,63}\.)+[a-zA-Z]{2,63}$')
+
+CASELESS_TYPES = {"domain", "host", "email", "ip"}
+
+# How much of the parent's priority an entity inherits through each relation
+RELATION_WEIGHTS = {
+    "resolves_to": 0.9,
+    "domain_email": 0.8,
+    "breached_in": 0.7,
+    "local_part": 0.6,
+    "announced_by": 0.5,
+    "mail_server": 0.5,
+    "profile_on": 0.4
+}
+
+def detect_entity_type(value):
+    """Guess the entity type of a seed value."""
+    try:
+        ipaddress.ip_address(value)
+        return "ip"
+    except ValueError:
+        pass
+    if EMAIL_PATTERN.match(value):
+        return "email"
+    if DOMAIN_PATTERN.match(value):
+        return "domain"
+    return "username"
+
+class PivotBudget:
+    """Per-provider call budget shared by all pivot workers."""
+    def __init__(self, limits=None, default_limit=25):
+        self.limits = dict(limits) if limits else {}
+        self.default_limit = default_limit
+        self.used = {}
+
+    def spend(self, provider):
+        """Reserve one call for a provider; return False once its budget is used up."""
+        limit = self.limits.get(provider, self.default_limit)
+        used = self.used.get(provider, 0)
+        if limit is not None and used >= limit:
+            return False
+        self.used[provider] = used + 1
+        return True
+
+    def remaining(self, provider):
+        limit = self.limits.get(provider, self.default_limit)
+        return None if limit is None else max(limit - self.used.get(provider, 0), 0)
+
+class AutoPivot:
+    """Recursively expand seed entities into related entities.
+
+    Entities wait on a priority frontier scored by how they were reached. Each one
+    is expanded once, up to a depth limit and within per-provider call budgets, and
+    every entity and link found is written into a DataCorrelation graph. With a
+    deadline, expansions still pending when time runs out are recorded as skipped
+    and the run returns what it found so far.
+    """
+    def __init__(self, domain_tool=None, geo_tool=None, email_tool=None, username_tool=None,
+                 correlation=None, max_depth=2, budget=None, concurrency=5, max_entities=500,
+                 emails_per_domain=100, deadline=None):
+        self.domain_tool = domain_tool
+        self.geo_tool = geo_tool
+        self.email_tool = email_tool
+        self.username_tool = username_tool
+        self.correlation = correlation
+        self.max_depth = max_depth
+        self.budget = budget if budget else PivotBudget()
+        self.concurrency = concurrency
+        self.max_entities = max_entities
+        self.emails_per_domain = emails_per_domain
+        self.deadline_seconds = deadline
+
+        self.expanders = {
+            "domain": [("dns", self._expand_dns), ("hunter", self._expand_domain_emails)],
+            "host": [("dns", self._expand_host)],
+            "ip": [("iptoasn", self._expand_asn)],
+            "email": [(None, self._expand_local_part), ("hibp", self._expand_breaches)],
+            "username": [("username_scan", self._expand_username)]
+        }
+
+    async def run(self, seeds):
+        """Expand seed values (or (value, type) pairs) and return a summary of the run."""
+        self._frontier = []
+        self._counter = itertools.count()
+        self._visited = set()
+        self._active = 0
+        self._condition = asyncio.Condition()
+        self.entities = {}
+        self.skipped = []
+        self.failed = []
+        self.deadline = Deadline(self.deadline_seconds)
+
+        for seed in seeds:
+            value, entity_type = seed if isinstance(seed, tuple) else (seed, detect_entity_type(seed))
+            self._push(value, entity_type, 0, 1.0, None, None)
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        await asyncio.gather(*workers)
+
+        return {
+            "entities": self.entities,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "budget_used": dict(self.budget.used)
+        }
+
+    def _push(self, value, entity_type, depth, score, parent, relation):
+        value = value.strip().rstrip(".")
+        key = (entity_type, value.lower() if entity_type in CASELESS_TYPES else value)
+        if parent is not None and self.correlation:
+            self.correlation.add_data_point(key[1], {"type": entity_type})
+            self.correlation.add_relationship(parent, key[1], relation)
+        if key in self._visited or len(self._visited) >= self.max_entities:
+            return
+        self._visited.add(key)
+        self.entities[key[1]] = {"type": entity_type, "depth": depth, "score": round(score, 3)}
+        heapq.heappush(self._frontier, (-score, depth, next(self._counter), key[1], entity_type))
+
+    async def _worker(self):
+        while True:
+            async with self._condition:
+                while not self._frontier and self._active:
+                    await self._condition.wait()
+                if not self._frontier:
+                    self._condition.notify_all()
+                    return
+                neg_score, depth, _, value, entity_type = heapq.heappop(self._frontier)
+                self._active += 1
+            try:
+                await self._expand(value, entity_type, depth, -neg_score)
+            finally:
+                async with self._condition:
+                    self._active -= 1
+                    self._condition.notify_all()
+
+    async def _expand(self, value, entity_type, depth, score):
+        data = {"type": entity_type, "depth": depth}
+        children = []
+        if depth < self.max_depth:
+            for provider, expander in self.expanders.get(entity_type, []):
+                if not self._configured(provider):
+                    continue
+                if self.deadline.expired:
+                    self.skipped.append({"entity": value, "provider": provider, "reason": "run deadline reached"})
+                    continue
+                if provider and not self.budget.spend(provider):
+                    self.skipped.append({"entity": value, "provider": provider, "reason": "budget exhausted"})
+                    continue
+                try:
+                    found, result = await asyncio.wait_for(expander(value), timeout=self.deadline.remaining())
+                except asyncio.TimeoutError:
+                    self.skipped.append({"entity": value, "provider": provider, "reason": "run deadline reached"})
+                    found, result = [], LookupResult(provider, "expand", value, SKIPPED, error="Skipped: run deadline reached")
+                except Exception as e:
+                    found, result = [], LookupResult(provider, "expand", value, ERROR, error=f"Error: {e}")
+                if provider and result is not None:
+                    data[provider] = result
+                    if result.status == ERROR:
+                        self.failed.append({"entity": value, "provider": provider, "error": result.error})
+                children.extend(found)
+
+        if self.correlation:
+            self.correlation.add_data_point(value, data)
+        for child, child_type, relation in children:
+            child_score = score * RELATION_WEIGHTS.get(relation, 0.5)
+            self._push(child, child_type, depth + 1, child_score, value, relation)
+
+    def _configured(self, provider):
+        """True if the tool behind a provider is set up, so spending its budget buys a call."""
+        if provider in ("hunter", "hibp"):
+            return bool(self.email_tool and getattr(self.email_tool, f"{provider}_api_key"))
+        tool = {"dns": self.domain_tool, "iptoasn": self.geo_tool, "username_scan": self.username_tool}
+        return provider not in tool or tool[provider] is not None
+
+    async def _expand_dns(self, domain):
+        if not self.domain_tool:
+            return [], None
+        result = await asyncio.to_thread(self.domain_tool.get_dns_records, domain)
+        if not result.ok:
+            return [], result
+        records = result.payload
+        found = []
+        for record_type in ("A", "AAAA"):
+            if isinstance(records.get(record_type), list):
+                found.extend((ip, "ip", "resolves_to") for ip in records[record_type])
+        if isinstance(records.get("MX"), list):
+            for mx in records["MX"]:
+                host = mx.split()[-1].rstrip(".")
+                if host:
+                    found.append((host, "host", "mail_server"))
+        return found, result
+
+    async def _expand_host(self, host):
+        found, result = await self._expand_dns(host)
+        return [child for child in found if child[1] == "ip"], result
+
+    async def _expand_domain_emails(self, domain):
+        if not self.email_tool or not self.email_tool.hunter_api_key:
+            return [], None
+        start = time.perf_counter()
+        emails = []
+        errors = []
+        async for record in self.email_tool.stream_domain_emails(domain, max_results=self.emails_per_domain):
+            if record.get("error"):
+                errors.append(record["error"])
+            elif record.get("email"):
+                emails.append(record["email"])
+        elapsed = time.perf_counter() - start
+        if errors:
+            # Keep the emails from pages that did load, but mark the expansion failed
+            result = LookupResult("hunter", "domain_search", domain, ERROR, payload=emails,
+                                  error="; ".join(dict.fromkeys(errors)), elapsed=elapsed)
+        else:
+            result = to_result("hunter", "domain_search", domain, emails, elapsed)
+        return [(email, "email", "domain_email") for email in emails], result
+
+    async def _expand_asn(self, ip):
+        if not self.geo_tool:
+            return [], None
+        result = await asyncio.to_thread(self.geo_tool.get_ip_asn, ip)
+        if not result.ok or not result.payload.get("as_number"):
+            return [], result
+        return [(f"AS{result.payload['as_number']}", "asn", "announced_by")], result
+
+    async def _expand_local_part(self, email):
+        local_part = email.split("@", 1)[0].split("+", 1)[0]
+        return [(local_part, "username", "local_part")], None
+
+    async def _expand_breaches(self, email):
+        if not self.email_tool or not self.email_tool.hibp_api_key:
+            return [], None
+        result = await asyncio.to_thread(self.email_tool.search_email_breaches, email)
+        if not result.ok:
+            return [], result
+        names = [breach.get("Name") for breach in result.payload if isinstance(breach, dict)]
+        return [(name, "breach", "breached_in") for name in names if name], result
+
+    async def _expand_username(self, username):
+        if not self.username_tool:
+            return [], None
+        result = await self.username_tool.lookup(username)
+        if not result.ok:
+            return [], result
+        found = [(f"{platform}:{username}", "profile", "profile_on")
+                 for platform, status in result.payload.items() if status == "Profile found"]
+        return found, result
+
+# Example Usage
+if __name__ == "__main__":
+    from domainlookupupdate import DomainLookup
+    from geolocationupdate import GeolocationIPAnalysis
+    from emaillookupupdate import EmailLeakSearch
+    from usernamelookup import UsernameLookup
+    from corelationsupdate import DataCorrelation
+    from singleflight import SingleFlight
+
+    flight = SingleFlight()
+    pivot = AutoPivot(
+        domain_tool=DomainLookup(flight=flight),
+        geo_tool=GeolocationIPAnalysis(flight=flight),
+        email_tool=EmailLeakSearch(),
+        username_tool=UsernameLookup(flight=flight),
+        correlation=DataCorrelation(),
+        max_depth=2,
+        budget=PivotBudget({"hunter": 5, "hibp": 10, "username_scan": 3}),
+        deadline=120
+    )
+    summary = asyncio.run(pivot.run(["example.com"]))
+    print("Entities:", summary["entities"])
+    print("Skipped:", summary["skipped"])
+    print("Failed:", summary["failed"])
+    print("Budget Used:", summary["budget_used"])
@@ -0,0 +1,215 @@
+import asyncio
+import threading
+import time
+import aiohttp
+import whois as whois_lookup
+from datetime import date, datetime
+from cachestore import DiskCache
+
+# Public suffixes with more than one label that are common in OSINT target lists
+MULTI_PART_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk", "me.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "co.nz", "org.nz", "co.za", "co.jp", "ne.jp", "or.jp", "co.kr", "co.in",
+    "com.br", "com.cn", "com.mx", "com.tr", "com.sg", "com.hk", "com.tw", "com.ar"
+}
+
+# Registry WHOIS servers shared by several TLDs; anything else gets its own bucket
+WHOIS_SERVERS = {
+    "com": "whois.verisign-grs.com",
+    "net": "whois.verisign-grs.com",
+    "org": "whois.publicinterestregistry.org",
+    "info": "whois.nic.info",
+    "io": "whois.nic.io",
+    "uk": "whois.nic.uk",
+    "de": "whois.denic.de",
+    "au": "whois.auda.org.au"
+}
+
+def registered_domain(domain):
+    """Reduce a host name to the domain that was actually registered."""
+    labels = domain.strip().rstrip(".").lower().split(".")
+    if len(labels) > 2 and ".".join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+def whois_server_for(domain):
+    """Return the WHOIS server that answers for a domain's TLD."""
+    tld = domain.rsplit(".", 1)[-1]
+    return WHOIS_SERVERS.get(tld, f"whois.nic.{tld}")
+
+def _first(value):
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value
+
+def _as_list(value):
+    if not value:
+        return []
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+def _iso(value):
+    value = _first(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value) if value else None
+
+class BulkWhois:
+    """Look up WHOIS records for many domains without hammering any registry.
+
+    Domains are reduced to their registered domain and looked up once. Queries
+    run concurrently, but each WHOIS server gets its own concurrency limit and a
+    minimum delay between queries. RDAP is used when plain WHOIS fails.
+
+    Concurrency limits belong to one lookup_many call (and its event loop);
+    the pacing between queries is shared by every call, so lookup_many_sync
+    can be used from several threads without exceeding a server's rate.
+    """
+    def __init__(self, per_server_concurrency=2, min_interval=1.0, cache_ttl=24 * 3600):
+        self.per_server_concurrency = per_server_concurrency
+        self.min_interval = min_interval
+        self.cache = DiskCache("whois", max_age=cache_ttl)
+        self._next_slot = {}
+        self._slot_lock = threading.Lock()
+
+    async def lookup_many(self, domains):
+        """Return a compact WHOIS record for every domain, keyed by the domain given."""
+        targets = {}
+        semaphores = {}
+        for domain in domains:
+            targets.setdefault(registered_domain(domain), []).append(domain)
+
+        async with aiohttp.ClientSession() as session:
+            tasks = {parent: asyncio.create_task(self._lookup(session, parent, semaphores)) for parent in targets}
+            await asyncio.gather(*tasks.values())
+
+        results = {}
+        for parent, originals in targets.items():
+            record = tasks[parent].result()
+            for domain in originals:
+                results[domain] = record
+        return results
+
+    def lookup_many_sync(self, domains):
+        """Blocking wrapper around lookup_many."""
+        return asyncio.run(self.lookup_many(domains))
+
+    async def _lookup(self, session, domain, semaphores):
+        cached = self.cache.get(domain)
+        if cached is not None:
+            return cached
+
+        server = whois_server_for(domain)
+        async with self._polite(semaphores, server):
+            try:
+                raw = await asyncio.to_thread(whois_lookup.whois, domain)
+                record = self.parse_whois(domain, raw)
+            except Exception:
+                record = None
+
+        if record is None or (not record["registrar"] and not record["name_servers"]):
+            async with self._polite(semaphores, "rdap.org"):
+                rdap_record = await self._lookup_rdap(session, domain)
+            if rdap_record is not None:
+                record = rdap_record
+
+        if record is None:
+            return {"domain": domain, "error": "No WHOIS or RDAP data found."}
+        self.cache.set(domain, record)
+        return record
+
+    def _polite(self, semaphores, server):
+        """Return a context manager enforcing this server's concurrency and pacing."""
+        if server not in semaphores:
+            semaphores[server] = asyncio.Semaphore(self.per_server_concurrency)
+        return _PoliteSlot(self, server, semaphores[server])
+
+    def _reserve_slot(self, server):
+        """Return the next time a query to server may start and push the following one back."""
+        with self._slot_lock:
+            slot = max(time.monotonic(), self._next_slot.get(server, 0.0))
+            self._next_slot[server] = slot + self.min_interval
+        return slot
+
+    async def _lookup_rdap(self, session, domain):
+        url = f"https://rdap.org/domain/{domain}"
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=20)) as response:
+                if response.status != 200:
+                    return None
+                return self.parse_rdap(domain, await response.json(content_type=None))
+        except Exception:
+            return None
+
+    def parse_whois(self, domain, raw):
+        """Reduce a python-whois result to a compact normalized record."""
+        return {
+            "domain": domain,
+            "registrar": _first(raw.get("registrar")),
+            "creation_date": _iso(raw.get("creation_date")),
+            "expiration_date": _iso(raw.get("expiration_date")),
+            "updated_date": _iso(raw.get("updated_date")),
+            "name_servers": sorted({ns.lower().rstrip(".") for ns in _as_list(raw.get("name_servers"))}),
+            "status": _as_list(raw.get("status")),
+            "emails": sorted(set(_as_list(raw.get("emails")))),
+            "org": _first(raw.get("org")),
+            "country": _first(raw.get("country")),
+            "source": "whois"
+        }
+
+    def parse_rdap(self, domain, data):
+        """Reduce an RDAP domain response to the same record shape as parse_whois."""
+        events = {event.get("eventAction"): event.get("eventDate") for event in data.get("events", [])}
+        registrar, org, country, emails = None, None, None, set()
+        for entity in data.get("entities", []):
+            vcard = {field[0]: field[3] for field in (entity.get("vcardArray") or [None, []])[1]}
+            roles = entity.get("roles", [])
+            if "registrar" in roles:
+                registrar = vcard.get("fn")
+            if "registrant" in roles:
+                org = vcard.get("org") or vcard.get("fn")
+                adr = vcard.get("adr")
+                if isinstance(adr, list) and adr:
+                    country = adr[-1] or None
+            if isinstance(vcard.get("email"), str):
+                emails.add(vcard["email"])
+        return {
+            "domain": domain,
+            "registrar": registrar,
+            "creation_date": events.get("registration"),
+            "expiration_date": events.get("expiration"),
+            "updated_date": events.get("last changed"),
+            "name_servers": sorted(ns.get("ldhName", "").lower() for ns in data.get("nameservers", [])),
+            "status": data.get("status", []),
+            "emails": sorted(emails),
+            "org": org,
+            "country": country,
+            "source": "rdap"
+        }
+
+class _PoliteSlot:
+    """Hold one of a server's query slots and space queries min_interval apart."""
+    def __init__(self, bulk, server, semaphore):
+        self.bulk = bulk
+        self.server = server
+        self.semaphore = semaphore
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        try:
+            delay = self.bulk._reserve_slot(self.server) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self.semaphore.release()
+            raise
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+# Example Usage
+if __name__ == "__main__":
+    bulk_whois = BulkWhois()
+    records = bulk_whois.lookup_many_sync(["example.com", "www.example.com", "mail.example.com", "example.org"])
+    for name, record in records.items():
+        print(name, record)
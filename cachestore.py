@@ -0,0 +1,48 @@
+import hashlib
+import json
+import os
+import time
+
+class DiskCache:
+    """Small file-backed JSON cache, one file per key.
+
+    Values survive restarts, so interrupted bulk jobs can resume without paying
+    again for lookups that already completed.
+    """
+    def __init__(self, namespace, cache_dir=".osint_cache", max_age=None):
+        self.path = os.path.join(cache_dir, namespace)
+        self.max_age = max_age
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, key):
+        digest = hashlib.sha1(str(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{digest}.json")
+
+    def get(self, key, default=None, max_age=None):
+        """Return the cached value for a key, or default if missing or expired."""
+        max_age = self.max_age if max_age is None else max_age
+        try:
+            with open(self._file(key), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return default
+        if max_age is not None and time.time() - entry["stored"] > max_age:
+            return default
+        return entry["value"]
+
+    def set(self, key, value):
+        """Store a JSON-serializable value under a key."""
+        path = self._file(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"key": str(key), "stored": time.time(), "value": value}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._file(key))
+        except OSError:
+            pass
+
+    def __contains__(self, key):
+        return self.get(key) is not None
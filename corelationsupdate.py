@@ -4,12 +4,14 @@ import itertools
 import numpy as np
 import matplotlib.pyplot as plt
 import nltk
-import configparser
 from nltk import ne_chunk, pos_tag, word_tokenize
 from nltk.tree import Tree
 from sklearn.ensemble import IsolationForest
 from openai import OpenAI
 from datetime import datetime
+from credentials import get_credentials
+from entityresolution import EntityResolver
+from results import LookupResult, to_jsonable
 
 # Download necessary NLTK data
 nltk.download('punkt')
@@ -17,23 +19,27 @@ nltk.download('maxent_ne_chunker')
 nltk.download('words')
 nltk.download('averaged_perceptron_tagger')
 
-# Load configuration
-def load_config():
-    config = configparser.ConfigParser()
-    config.read('config.ini')
-    return config['API_KEYS'].get('openai_api_key', None)
-
 class DataCorrelation:
-    def __init__(self):
+    def __init__(self, credentials=None, resolve_entities=True, similarity_threshold=0.6):
         self.graph = nx.Graph()
+        self.resolver = EntityResolver(threshold=similarity_threshold) if resolve_entities else None
         self.anomaly_detector = IsolationForest(contamination=0.1)
-        self.openai_api_key = load_config()
+        self.credentials = credentials if credentials else get_credentials()
+        self.openai_api_key = self.credentials.acquire("openai")
         self.openai_client = OpenAI(api_key=self.openai_api_key) if self.openai_api_key else None
     
     def add_data_point(self, entity, data):
-        """Add a data point to the graph."""
+        """Add a data point to the graph, linking it to near-duplicate identities."""
         self.graph.add_node(entity, **data)
+        if self.resolver:
+            for other, score in self.resolver.add(entity, data):
+                if not self.graph.has_edge(entity, other):
+                    self.graph.add_edge(entity, other, relation="similar_identity", weight=score)
     
+    def add_result(self, entity, result):
+        """Store a LookupResult on an entity's node, keyed by provider and operation."""
+        self.add_data_point(entity, {f"{result.provider}_{result.operation}": result})
+
     def add_relationship(self, entity1, entity2, relation):
         """Create a relationship between two entities."""
         self.graph.add_edge(entity1, entity2, relation=relation)
@@ -52,7 +58,8 @@ class DataCorrelation:
         features = []
         entities = list(self.graph.nodes(data=True))
         for _, data in entities:
-            features.append([hash(str(value)) % 1000 for value in data.values()])
+            features.append([hash(str(value.payload if isinstance(value, LookupResult) else value)) % 1000
+                             for value in data.values()])
         
         if len(features) < 2:
             return "Not enough data for anomaly detection."
@@ -101,8 +108,8 @@ class DataCorrelation:
     def generate_report(self, filename="correlation_report.txt"):
         """Generate an automated report with detected patterns and anomalies."""
         report_content = f"Data Correlation Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report_content += "\nPatterns Identified:\n" + json.dumps(self.find_patterns(), indent=4)
-        report_content += "\nAnomalies Detected:\n" + json.dumps(self.detect_anomalies(), indent=4)
+        report_content += "\nPatterns Identified:\n" + json.dumps(self.find_patterns(), indent=4, default=to_jsonable)
+        report_content += "\nAnomalies Detected:\n" + json.dumps(self.detect_anomalies(), indent=4, default=to_jsonable)
         
         with open(filename, "w") as f:
             f.write(report_content)
@@ -122,7 +129,7 @@ class DataCorrelation:
         """Export the graph data as JSON."""
         data = nx.node_link_data(self.graph)
         with open(filename, "w") as f:
-            json.dump(data, f, indent=4)
+            json.dump(data, f, indent=4, default=to_jsonable)
     
 # Example Usage
 if __name__ == "__main__":
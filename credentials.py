@@ -0,0 +1,241 @@
+import configparser
+import os
+import threading
+import time
+
+# config.ini option holding each provider's key(s) in the [API_KEYS] section
+PROVIDER_OPTIONS = {
+    "openai": "openai_api_key",
+    "shodan": "shodan_api_key",
+    "hibp": "hibp_api_key",
+    "hunter": "hunter_api_key",
+    "maxmind": "maxmind_api_key",
+    "ipqualityscore": "ipqualityscore_api_key",
+    "historical_ip": "historical_ip_api_key"
+}
+# A 403 is often about the request (blocked User-Agent, region, plan feature), not the key
+FORBIDDEN_COOLDOWN = 15 * 60
+
+class ApiKey:
+    """Scheduling state for one key in a provider's pool."""
+    __slots__ = ("value", "remaining", "exhausted_until", "revoked", "uses", "last_used")
+
+    def __init__(self, value):
+        self.value = value
+        self.remaining = None
+        self.exhausted_until = 0.0
+        self.revoked = False
+        self.uses = 0
+        self.last_used = 0.0
+
+    def available(self, now):
+        return not self.revoked and self.exhausted_until <= now
+
+class CredentialProvider:
+    """Load config.ini once and hand out API keys from per-provider pools.
+
+    A provider may list several keys, comma-separated or as numbered options
+    (hibp_api_key, hibp_api_key_2, ...). Requests go to the key with the most
+    remaining quota, round-robin among equals. Keys rejected with 401 are
+    revoked; keys that get a 403 or hit their quota sit out a cool-off. Edits
+    to the file are picked up without a restart and give revoked keys another
+    chance. If throttle is set, throttle(provider) is called every time a key
+    is handed out, i.e. once per outbound request, retries included.
+    """
+    def __init__(self, config_path="config.ini", reload_interval=5.0):
+        self.config_path = config_path
+        self.reload_interval = reload_interval
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._checked = 0.0
+        self.config = configparser.ConfigParser()
+        self.pools = {}
+        self.throttle = None
+        self._reload()
+
+    def _reload(self):
+        config = configparser.ConfigParser()
+        config.read(self.config_path)
+        pools = {}
+        for provider, option in PROVIDER_OPTIONS.items():
+            values = []
+            if config.has_section("API_KEYS"):
+                for name, raw in config.items("API_KEYS"):
+                    if name == option or name.startswith(f"{option}_"):
+                        values.extend(v.strip() for v in raw.split(",") if v.strip())
+            old_pool = {key.value: key for key in self.pools.get(provider, [])}
+            pools[provider] = [old_pool.get(value) or ApiKey(value) for value in dict.fromkeys(values)]
+            for key in pools[provider]:
+                key.revoked = False
+        self.config = config
+        self.pools = pools
+        self._mtime = os.path.getmtime(self.config_path) if os.path.exists(self.config_path) else None
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return
+        self._checked = now
+        mtime = os.path.getmtime(self.config_path) if os.path.exists(self.config_path) else None
+        if mtime != self._mtime:
+            self._reload()
+
+    def section(self, name):
+        """Return a config section (e.g. Twitter, Reddit, Proxy) as a dict."""
+        with self._lock:
+            self._maybe_reload()
+            return dict(self.config[name]) if self.config.has_section(name) else {}
+
+    def has(self, provider):
+        """Return True if the provider has at least one key in rotation."""
+        return self.peek(provider) is not None
+
+    def peek(self, provider):
+        """Return the key that would be scheduled next, without using it."""
+        with self._lock:
+            self._maybe_reload()
+            key = self._select(provider)
+            return key.value if key else None
+
+    def acquire(self, provider, exclude=()):
+        """Schedule a request on the best available key and return it, or None."""
+        with self._lock:
+            self._maybe_reload()
+            key = self._select(provider, exclude)
+            if key is None:
+                return None
+            key.uses += 1
+            key.last_used = time.monotonic()
+            if key.remaining is not None:
+                key.remaining -= 1
+        if self.throttle:
+            self.throttle(provider)
+        return key.value
+
+    def _select(self, provider, exclude=()):
+        now = time.monotonic()
+        candidates = [key for key in self.pools.get(provider, [])
+                      if key.available(now) and key.value not in exclude]
+        if not candidates:
+            return None
+        # Most remaining quota first (unknown counts as plenty), then least recently used
+        return max(candidates, key=lambda key: (
+            float("inf") if key.remaining is None else key.remaining, -key.last_used))
+
+    def report_response(self, provider, key, status_code, headers=None):
+        """Update a key from an HTTP response; return True if it was taken out of rotation."""
+        headers = headers or {}
+        with self._lock:
+            entry = self._find(provider, key)
+            if entry is None:
+                return False
+            remaining = headers.get("X-RateLimit-Remaining")
+            if remaining is not None and str(remaining).isdigit():
+                entry.remaining = int(remaining)
+            if status_code == 401:
+                entry.revoked = True
+                return True
+            if status_code == 403:
+                entry.exhausted_until = time.monotonic() + FORBIDDEN_COOLDOWN
+                return True
+            if status_code == 429:
+                retry_after = headers.get("Retry-After")
+                delay = float(retry_after) if retry_after and str(retry_after).isdigit() else 60.0
+                entry.exhausted_until = time.monotonic() + delay
+                return True
+            return False
+
+    def report_error(self, provider, key, message):
+        """Update a key from a provider error message; return True if it was taken out of rotation."""
+        message = str(message).lower()
+        if "invalid api key" in message or "unauthorized" in message:
+            return self.report_response(provider, key, 401)
+        if "access denied" in message or "forbidden" in message:
+            return self.report_response(provider, key, 403)
+        if "rate limit" in message or "credits" in message or "quota" in message:
+            return self.report_response(provider, key, 429)
+        return False
+
+    def _find(self, provider, value):
+        for key in self.pools.get(provider, []):
+            if key.value == value:
+                return key
+        return None
+
+    def call(self, provider, send):
+        """Call send(key) on scheduled keys until one is not rejected for quota or auth.
+
+        Returns the last response, or None if the provider has no usable key.
+        """
+        tried = set()
+        response = None
+        while True:
+            key = self.acquire(provider, exclude=tried)
+            if key is None:
+                return response
+            tried.add(key)
+            response = send(key)
+            if not self.report_response(provider, key, response.status_code, response.headers):
+                return response
+
+    def status(self):
+        """Summarize each provider's pool for display."""
+        with self._lock:
+            now = time.monotonic()
+            return {provider: {
+                "keys": len(pool),
+                "available": sum(key.available(now) for key in pool),
+                "revoked": sum(key.revoked for key in pool),
+                "uses": sum(key.uses for key in pool)
+            } for provider, pool in self.pools.items() if pool}
+
+class RotatingClient:
+    """Wrap an SDK client (e.g. shodan.Shodan) so every call uses the pool's scheduled key.
+
+    Calls that fail with one of error_types are retried on the next key when
+    the error shows the key is revoked or out of quota.
+    """
+    def __init__(self, credentials, provider, factory, error_types=(Exception,)):
+        self.credentials = credentials
+        self.provider = provider
+        self.factory = factory
+        self.error_types = error_types
+        self._clients = {}
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            tried = set()
+            last_error = None
+            while True:
+                key = self.credentials.acquire(self.provider, exclude=tried)
+                if key is None:
+                    if last_error is not None:
+                        raise last_error
+                    raise RuntimeError(f"No {self.provider} API key available.")
+                tried.add(key)
+                if key not in self._clients:
+                    self._clients[key] = self.factory(key)
+                try:
+                    return getattr(self._clients[key], name)(*args, **kwargs)
+                except self.error_types as e:
+                    if not self.credentials.report_error(self.provider, key, e):
+                        raise
+                    last_error = e
+        return method
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+def get_credentials(config_path="config.ini"):
+    """Return the shared CredentialProvider for a config file."""
+    path = os.path.abspath(config_path)
+    with _providers_lock:
+        if path not in _providers:
+            _providers[path] = CredentialProvider(config_path)
+        return _providers[path]
+
+# Example Usage
+if __name__ == "__main__":
+    credentials = get_credentials()
+    print("Credential pools:", credentials.status())
+    print("Next HIBP key configured:", credentials.has("hibp"))
@@ -0,0 +1,379 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from autopivot import detect_entity_type
+from credentials import PROVIDER_OPTIONS
+from results import LookupResult, to_result, to_jsonable, ERROR
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# Calls per second allowed for each provider across every worker on every node
+PROVIDER_RATE_LIMITS = {
+    "hibp": 10 / 60,
+    "hunter": 10,
+    "maxmind": 20,
+    "ipqualityscore": 5,
+    "iptoasn": 5,
+    "shodan": 1,
+    "whois": 2,
+    "twitter": 900 / 900,
+    "reddit": 1,
+    "instagram": 20 / 60,
+    "linkedin": 30 / 60
+}
+
+# operation: (provider, entity type, tools attribute, method)
+OPERATIONS = {
+    "ip_location": ("maxmind", "ip", "geo", "get_ip_location"),
+    "ip_asn": ("iptoasn", "ip", "geo", "get_ip_asn"),
+    "reverse_dns": ("dns", "ip", "geo", "reverse_dns_lookup"),
+    "domain_ip": ("dns", "domain", "domain", "get_ip"),
+    "whois": ("whois", "domain", "domain", "get_whois"),
+    "dns_records": ("dns", "domain", "domain", "get_dns_records"),
+    "email_breaches": ("hibp", "email", "email", "search_email_breaches"),
+    "email_sources": ("hunter", "email", "email", "search_email_sources"),
+    "username_scan": ("username_scan", "username", "username", "lookup"),
+    "twitter": ("twitter", "username", "social", "search_twitter_user"),
+    "reddit": ("reddit", "username", "social", "search_reddit_user"),
+    "instagram": ("instagram", "username", "social", "search_instagram_user"),
+    "linkedin": ("linkedin", "username", "social", "search_linkedin_user")
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    job TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    target TEXT NOT NULL,
+    status TEXT NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    updated REAL NOT NULL,
+    UNIQUE (job, operation, target)
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, lease_expires);
+CREATE INDEX IF NOT EXISTS tasks_job ON tasks (job, status);
+CREATE TABLE IF NOT EXISTS rate_limits (
+    provider TEXT PRIMARY KEY,
+    next_slot REAL NOT NULL
+);
+"""
+
+class WorkQueue:
+    """Durable task queue in a SQLite file shared by a coordinator and any number of workers.
+
+    Workers lease tasks for a visibility timeout and extend the lease with
+    heartbeats. A task whose lease runs out (its worker died or stalled) goes
+    back to other workers, and a result is only accepted from the worker that
+    currently holds the lease. Tasks that keep failing are marked failed after
+    max_attempts leases.
+
+    WAL journaling only works between processes on one host; when workers on
+    several hosts share the file over a network filesystem, use
+    journal_mode="delete" on a filesystem with working POSIX locks.
+    """
+    def __init__(self, path="osint_queue.db", max_attempts=3, journal_mode="wal"):
+        self.path = path
+        self.journal_mode = journal_mode
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    def enqueue(self, job, tasks):
+        """Add (operation, target) tasks to a job, ignoring ones it already has."""
+        now = time.time()
+        with self._transaction() as db:
+            db.executemany(
+                "INSERT OR IGNORE INTO tasks (job, operation, target, status, updated) VALUES (?, ?, ?, ?, ?)",
+                [(job, operation, target, QUEUED, now) for operation, target in tasks])
+
+    def lease(self, worker_id, limit=10, visibility_timeout=120):
+        """Lease up to limit ready tasks; return [(task_id, operation, target)]."""
+        now = time.time()
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, operation, target, attempts FROM tasks "
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) ORDER BY id LIMIT ?",
+                (QUEUED, LEASED, now, limit)).fetchall()
+            leased = []
+            for task_id, operation, target, attempts in rows:
+                if attempts >= self.max_attempts:
+                    db.execute("UPDATE tasks SET status = ?, lease_owner = NULL, updated = ? WHERE id = ?",
+                               (FAILED, now, task_id))
+                    continue
+                db.execute("UPDATE tasks SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                           "updated = ? WHERE id = ?", (LEASED, worker_id, now + visibility_timeout, now, task_id))
+                leased.append((task_id, operation, target))
+            return leased
+
+    def heartbeat(self, worker_id, task_ids, visibility_timeout=120):
+        """Extend the leases a worker still holds; return the ids it has lost."""
+        now = time.time()
+        lost = []
+        with self._transaction() as db:
+            for task_id in task_ids:
+                updated = db.execute("UPDATE tasks SET lease_expires = ?, updated = ? "
+                                     "WHERE id = ? AND status = ? AND lease_owner = ?",
+                                     (now + visibility_timeout, now, task_id, LEASED, worker_id)).rowcount
+                if not updated:
+                    lost.append(task_id)
+        return lost
+
+    def complete(self, worker_id, task_id, result):
+        """Store a task's LookupResult; return False if the worker no longer held the lease."""
+        with self._transaction() as db:
+            return db.execute("UPDATE tasks SET status = ?, result = ?, lease_owner = NULL, updated = ? "
+                              "WHERE id = ? AND status = ? AND lease_owner = ?",
+                              (DONE, json.dumps(result.to_dict(), default=to_jsonable), time.time(),
+                               task_id, LEASED, worker_id)).rowcount == 1
+
+    def release(self, worker_id, task_id):
+        """Give a task back immediately, e.g. after an exception, so another lease can retry it."""
+        with self._transaction() as db:
+            db.execute("UPDATE tasks SET status = ?, lease_owner = NULL, updated = ? "
+                       "WHERE id = ? AND lease_owner = ?", (QUEUED, time.time(), task_id, worker_id))
+
+    def progress(self, job):
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM tasks WHERE job = ? GROUP BY status", (job,))
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    def results(self, job):
+        """Yield a LookupResult for every finished task of a job."""
+        rows = self._connection().execute(
+            "SELECT operation, target, status, result FROM tasks WHERE job = ? AND status IN (?, ?) ORDER BY id",
+            (job, DONE, FAILED))
+        for operation, target, status, result in rows:
+            if result:
+                yield LookupResult.from_dict(json.loads(result))
+            else:
+                provider = OPERATIONS.get(operation, (operation,))[0]
+                yield LookupResult(provider, operation, target, ERROR, error="Error: task failed on every attempt.")
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent workers never lease the same task."""
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+class GlobalRateLimiter:
+    """Per-provider pacing shared by every process using the same queue file.
+
+    Each provider has one next free slot in the database; a caller claims the
+    slot in a write transaction, pushes it forward by the provider's interval
+    and sleeps until its slot. Adding workers adds throughput only until the
+    provider's limit is reached. A slot is charged for every outbound request:
+    QueueWorker hooks wait() into key scheduling, so a retry on another key
+    pays for its own slot, and runs its tools without hedging, so no request
+    is sent twice.
+    """
+    def __init__(self, queue, limits=None):
+        self.queue = queue
+        self.limits = {**PROVIDER_RATE_LIMITS, **(limits or {})}
+
+    def wait(self, provider):
+        rate = self.limits.get(provider)
+        if not rate:
+            return
+        with self.queue._transaction() as db:
+            row = db.execute("SELECT next_slot FROM rate_limits WHERE provider = ?", (provider,)).fetchone()
+            now = time.time()
+            slot = max(now, row[0] if row else 0.0)
+            db.execute("INSERT OR REPLACE INTO rate_limits (provider, next_slot) VALUES (?, ?)",
+                       (provider, slot + 1.0 / rate))
+        if slot > now:
+            time.sleep(slot - now)
+
+class Coordinator:
+    """Shard target lists into per-(operation, target) tasks and collect their results."""
+    def __init__(self, queue):
+        self.queue = queue
+
+    def submit(self, targets, operations=None, job=None):
+        """Queue every applicable operation for each target and return the job id."""
+        job = job if job else uuid.uuid4().hex
+        tasks = []
+        for target in dict.fromkeys(t.strip() for t in targets if t.strip()):
+            entity_type = detect_entity_type(target)
+            for operation, (_, applies_to, _, _) in OPERATIONS.items():
+                if applies_to == entity_type and (operations is None or operation in operations):
+                    tasks.append((operation, target))
+        self.queue.enqueue(job, tasks)
+        return job
+
+    def wait(self, job, poll_interval=5, on_progress=None):
+        """Block until no task of the job is queued or leased; return the final counts."""
+        while True:
+            progress = self.queue.progress(job)
+            if on_progress:
+                on_progress(progress)
+            if not progress[QUEUED] and not progress[LEASED]:
+                return progress
+            time.sleep(poll_interval)
+
+class QueueWorker:
+    """Lease tasks from a WorkQueue and run them with the existing lookup classes."""
+    def __init__(self, queue, tools=None, worker_id=None, concurrency=8, batch_size=16,
+                 visibility_timeout=120, heartbeat_interval=30, rate_limiter=None):
+        self.queue = queue
+        self.tools = tools
+        self.worker_id = worker_id if worker_id else f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.visibility_timeout = visibility_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.rate_limiter = rate_limiter if rate_limiter else GlobalRateLimiter(queue)
+        self.processed = 0
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self, stop_when_idle=False, idle_sleep=2.0):
+        """Process tasks until stopped, or until the queue is empty if stop_when_idle."""
+        owns_tools = self.tools is None
+        if owns_tools:
+            from pipeline import OSINTTools
+            self.tools = OSINTTools.from_config()
+        shared_tools = self.tools
+        # A hedge would be an uncharged second request, and time spent waiting
+        # for a slot would inflate the p95 that triggers hedges, so never hedge here
+        if hasattr(shared_tools, "for_run"):
+            self.tools = shared_tools.for_run(hedge=False)
+        # Keyed providers are paced per request as keys are handed out, retries included
+        credentials = getattr(self.tools, "credentials", None)
+        previous_throttle = credentials.throttle if credentials else None
+        if credentials:
+            credentials.throttle = self.rate_limiter.wait
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+        slots = threading.Semaphore(self.concurrency)
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                while not self._stop.is_set():
+                    # Lease only as many tasks as there are free threads, so leases do not sit idle
+                    slots.acquire()
+                    free = 1
+                    while free < self.batch_size and slots.acquire(blocking=False):
+                        free += 1
+                    tasks = self.queue.lease(self.worker_id, free, self.visibility_timeout)
+                    for _ in range(free - len(tasks)):
+                        slots.release()
+                    if not tasks:
+                        with self._held_lock:
+                            busy = bool(self._held)
+                        if stop_when_idle and not busy:
+                            break
+                        self._stop.wait(idle_sleep)
+                        continue
+                    with self._held_lock:
+                        self._held.update(task[0] for task in tasks)
+                    for task in tasks:
+                        executor.submit(self._process, task).add_done_callback(lambda _: slots.release())
+        finally:
+            self._stop.set()
+            if credentials:
+                credentials.throttle = previous_throttle
+            self.tools = shared_tools
+        if owns_tools:
+            self.tools.close()
+            self.tools = None
+        return self.processed
+
+    def stop(self):
+        self._stop.set()
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            with self._held_lock:
+                held = list(self._held)
+            if held:
+                lost = self.queue.heartbeat(self.worker_id, held, self.visibility_timeout)
+                with self._held_lock:
+                    self._held.difference_update(lost)
+
+    def _process(self, task):
+        task_id, operation, target = task
+        try:
+            if operation not in OPERATIONS:
+                result = LookupResult("queue", operation, target, ERROR, error=f"Error: unknown operation {operation}")
+            else:
+                result = self.run_operation(operation, target)
+            self.queue.complete(self.worker_id, task_id, result)
+            self.processed += 1
+        except Exception:
+            self.queue.release(self.worker_id, task_id)
+        finally:
+            with self._held_lock:
+                self._held.discard(task_id)
+
+    def run_operation(self, operation, target):
+        provider, _, tool_name, method_name = OPERATIONS[operation]
+        if provider not in PROVIDER_OPTIONS:
+            # No key pool to hook into, so charge the task's single call here
+            self.rate_limiter.wait(provider)
+        method = getattr(getattr(self.tools, tool_name), method_name)
+        if asyncio.iscoroutinefunction(method):
+            value = asyncio.run(method(target))
+        else:
+            value = method(target)
+        return to_result(provider, operation, target, value)
+
+# Example Usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded bulk investigations over a shared work queue")
+    parser.add_argument("role", choices=["coordinator", "worker"])
+    parser.add_argument("--db", default="osint_queue.db", help="queue file shared by all nodes")
+    parser.add_argument("--journal", default="wal", choices=["wal", "delete"],
+                        help="use delete when nodes share the file over a network filesystem")
+    parser.add_argument("--targets", help="coordinator: file with one target per line")
+    parser.add_argument("--operations", help="coordinator: comma-separated subset of operations")
+    parser.add_argument("--job", help="coordinator: job id to resume or name")
+    parser.add_argument("--output", default="results.jsonl", help="coordinator: JSONL file for results")
+    parser.add_argument("--concurrency", type=int, default=8, help="worker: tasks run at once")
+    args = parser.parse_args()
+
+    work_queue = WorkQueue(args.db, journal_mode=args.journal)
+    if args.role == "coordinator":
+        coordinator = Coordinator(work_queue)
+        with open(args.targets, "r") as f:
+            job_id = coordinator.submit(f, args.operations.split(",") if args.operations else None, args.job)
+        print("Job:", job_id)
+        print("Final:", coordinator.wait(job_id, on_progress=lambda progress: print("Progress:", progress)))
+        from results import write_jsonl
+        with open(args.output, "w") as out:
+            write_jsonl(work_queue.results(job_id), out)
+        print("Results written to", args.output)
+    else:
+        worker = QueueWorker(work_queue, concurrency=args.concurrency)
+        print("Worker", worker.worker_id, "processed", worker.run(), "tasks")
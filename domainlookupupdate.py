@@ -3,50 +3,84 @@ import socket
 import whois as whois_lookup
 import dns.resolver
 import shodan
-import configparser
-
-# Load configuration
-def load_config():
-    config = configparser.ConfigParser()
-    config.read('config.ini')
-    return config['API_KEYS'].get('shodan_api_key', None)
+from singleflight import SingleFlight
+from credentials import get_credentials, RotatingClient
+from bulkwhois import BulkWhois
+from shodanenrich import ShodanEnrichment
+from results import lookup_result, ptr_payload
+from resilience import get_resilience, ProviderSkipped
 
 class DomainLookup:
-    def __init__(self, proxy=None):
+    def __init__(self, proxy=None, flight=None, credentials=None, resilience=None):
         self.proxy = {"http": proxy, "https": proxy} if proxy else None
-        self.shodan_api_key = load_config()
-        self.shodan_api = shodan.Shodan(self.shodan_api_key) if self.shodan_api_key else None
+        self.flight = flight if flight else SingleFlight()
+        self.credentials = credentials if credentials else get_credentials()
+        self.resilience = resilience if resilience else get_resilience()
+        self.bulk_whois = BulkWhois()
+        self._shodan_client = RotatingClient(self.credentials, "shodan", shodan.Shodan, error_types=(shodan.APIError,))
+        self.shodan_enrichment = ShodanEnrichment(self._shodan_client, resolve=self._get_ip)
+
+    @property
+    def shodan_api(self):
+        """Shodan client that spreads calls over the configured key pool, or None."""
+        return self._shodan_client if self.credentials.has("shodan") else None
 
+    @lookup_result("dns", "a_record")
     def get_ip(self, domain):
         """Retrieve the IP address of a domain."""
+        return self._get_ip(domain)
+
+    def _get_ip(self, domain):
+        return self.flight.do("dns_a", domain, self._resolve_ip, domain)
+
+    def _resolve_ip(self, domain):
         try:
             return socket.gethostbyname(domain)
         except socket.gaierror:
             return "Could not resolve domain."
 
+    @lookup_result("whois", "whois")
     def get_whois(self, domain):
         """Retrieve WHOIS information of a domain."""
         try:
-            return whois_lookup.whois(domain)
+            # Not hedged: a duplicate query only adds load on a rate-limited registry
+            return self.resilience.call("whois", lambda timeout: whois_lookup.whois(domain), idempotent=False)
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Error: {e}"
 
+    @lookup_result("whois", "whois_bulk")
+    def get_whois_bulk(self, domains):
+        """Retrieve compact WHOIS records for many domains, throttled per registry."""
+        return self.bulk_whois.lookup_many_sync(domains)
+
+    @lookup_result("dns", "records")
     def get_dns_records(self, domain):
         """Retrieve DNS records of a domain."""
         records = {}
         try:
             for record_type in ['A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME', 'SOA', 'PTR']:  # Added PTR for reverse DNS
-                try:
-                    answers = dns.resolver.resolve(domain, record_type)
-                    records[record_type] = [answer.to_text() for answer in answers]
-                except dns.resolver.NoAnswer:
-                    records[record_type] = "No record found."
-                except dns.resolver.NXDOMAIN:
-                    return "Domain does not exist."
+                answers = self.resilience.call("dns", lambda timeout: self._resolve_records(domain, record_type, timeout))
+                if answers == "Domain does not exist.":
+                    return answers
+                records[record_type] = answers
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Error: {e}"
         return records
 
+    def _resolve_records(self, domain, record_type, timeout):
+        """Resolve one record type within timeout; a missing record or domain is an answer, not a failure."""
+        try:
+            return [answer.to_text() for answer in dns.resolver.resolve(domain, record_type, lifetime=timeout)]
+        except dns.resolver.NoAnswer:
+            return "No record found."
+        except dns.resolver.NXDOMAIN:
+            return "Domain does not exist."
+
+    @lookup_result("dns", "subdomains")
     def get_subdomains(self, domain, wordlist_file=None):
         """Brute-force subdomain enumeration using a wordlist file or default list."""
         subdomains = {}
@@ -61,26 +95,49 @@ class DomainLookup:
         
         for sub in wordlist:
             subdomain = f"{sub}.{domain}"
-            try:
-                subdomains[subdomain] = socket.gethostbyname(subdomain)
-            except socket.gaierror:
-                subdomains[subdomain] = "Not found"
+            ip = self._get_ip(subdomain)
+            subdomains[subdomain] = "Not found" if ip == "Could not resolve domain." else ip
         return subdomains
 
+    @lookup_result("shodan", "host")
     def get_shodan_info(self, domain):
         """Retrieve domain-related information from Shodan."""
         if not self.shodan_api:
             return "Shodan API key not configured."
         try:
-            ip = self.get_ip(domain)
+            ip = self._get_ip(domain)
             if "Could not resolve domain." in ip:
                 return ip
-            return self.shodan_api.host(ip)
+            return self.flight.do("shodan_host", ip, self._shodan_host, ip)
+        except ProviderSkipped as e:
+            return str(e)
         except shodan.APIError as e:
             return f"Shodan Error: {e}"
 
+    def _shodan_host(self, ip):
+        # Not hedged: every Shodan host lookup spends query credits
+        return self.resilience.call("shodan", lambda timeout: self.shodan_api.host(ip), idempotent=False)
+
+    @lookup_result("shodan", "host_bulk")
+    def get_shodan_info_bulk(self, domains):
+        """Retrieve Shodan host data for many domains, querying each distinct IP once."""
+        if not self.shodan_api:
+            return "Shodan API key not configured."
+        # Pace to the keys available now; the pool can shrink as keys hit their quota
+        keys = self.credentials.status().get("shodan", {}).get("available", 1)
+        self.shodan_enrichment.min_interval = 1.0 / max(keys, 1)
+        results = self.shodan_enrichment.enrich(domains)
+        for entry in results.values():
+            if isinstance(entry["shodan"], dict) and entry["shodan"].get("source") != "net_search":
+                self.flight.store("shodan_host", entry["ip"], entry["shodan"])
+        return results
+
+    @lookup_result("dns", "ptr", normalize=ptr_payload)
     def reverse_ip_lookup(self, ip):
         """Perform a reverse IP lookup to find associated domains."""
+        return self.flight.do("dns_ptr", ip, self._reverse_dns, ip)
+
+    def _reverse_dns(self, ip):
         try:
             return socket.gethostbyaddr(ip)
         except socket.herror:
@@ -96,4 +153,5 @@ if __name__ == "__main__":
     print("DNS Records:", lookup_tool.get_dns_records(domain))
     print("Subdomains:", lookup_tool.get_subdomains(domain, wordlist_file="subdomains.txt"))
     print("Shodan Info:", lookup_tool.get_shodan_info(domain))
-    print("Reverse IP Lookup:", lookup_tool.reverse_ip_lookup(ip_address))
+    if ip_address.ok:
+        print("Reverse IP Lookup:", lookup_tool.reverse_ip_lookup(ip_address.payload))
@@ -0,0 +1,265 @@
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone
+import dns.asyncresolver
+import dns.exception
+import dns.name
+import dns.resolver
+from bulkwhois import BulkWhois
+from cachestore import DiskCache
+
+DNS_RECORD_TYPES = ("A", "AAAA", "MX", "NS", "TXT", "CNAME", "SOA")
+WHOIS_FIELDS = ("registrar", "creation_date", "expiration_date", "updated_date", "name_servers",
+                "status", "emails", "org", "country")
+DAY = 24 * 3600
+EXPIRY_GRACE = 80 * DAY  # Auto-renew grace, redemption and pending-delete periods after expiry
+UNKNOWN = object()  # The resolver could not get an answer; says nothing about the records
+
+def _parse_date(value):
+    """Parse an ISO date from a WHOIS/RDAP record into a UTC timestamp, or None."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def valid_domain(domain):
+    """True if the name can be sent to a resolver: no empty or over-long labels, no spaces."""
+    if not domain or any(char.isspace() for char in domain):
+        return False
+    try:
+        return len(dns.name.from_text(domain).labels) > 2
+    except dns.exception.DNSException:
+        return False
+
+def diff_snapshots(old, new, fields):
+    """Return {field: {"old", "new", "added", "removed"}} for every field that changed.
+
+    Lists are compared as sorted, so a server returning the same values in a
+    different order is not a change.
+    """
+    changes = {}
+    for field in fields:
+        before, after = old.get(field), new.get(field)
+        if isinstance(before, list):
+            before = sorted(before)
+        if isinstance(after, list):
+            after = sorted(after)
+        if before == after:
+            continue
+        change = {"old": before, "new": after}
+        if isinstance(before, list) or isinstance(after, list):
+            change["added"] = sorted(set(after or []) - set(before or []))
+            change["removed"] = sorted(set(before or []) - set(after or []))
+        changes[field] = change
+    return changes
+
+class DomainMonitor:
+    """Watch many domains for DNS and WHOIS changes, querying each only when it is due.
+
+    Every (domain, check) pair sits on a heap ordered by its next due time. DNS
+    checks are due again when the shortest TTL in the answer runs out, clamped
+    to [min_interval, max_interval]. WHOIS checks run every whois_interval, and
+    daily from whois_interval before the expiry date until the grace periods
+    after it are over, when registrations are renewed or dropped. Lookups that
+    time out or fail keep the last snapshot and are retried sooner. Snapshots
+    and due times persist on disk, so a restart resumes the schedule and only
+    changed fields are emitted as events.
+    """
+    def __init__(self, domains=(), record_types=DNS_RECORD_TYPES, min_interval=300, max_interval=DAY,
+                 negative_interval=3600, whois_interval=7 * DAY, concurrency=50, bulk_whois=None,
+                 on_change=None, cache_dir=".osint_cache"):
+        self.record_types = record_types
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.negative_interval = negative_interval
+        self.whois_interval = whois_interval
+        self.concurrency = concurrency
+        self.bulk_whois = bulk_whois if bulk_whois else BulkWhois(cache_ttl=0)
+        self.on_change = on_change
+        self.snapshots = DiskCache("monitor", cache_dir=cache_dir)
+        self.resolver = dns.asyncresolver.Resolver()
+        self.resolver.lifetime = 10.0
+        self.domains = set()
+        self.stats = {"dns_queries": 0, "whois_queries": 0, "events": 0, "errors": 0}
+        self._heap = []
+        self._counter = itertools.count()
+        self._tokens = {}  # (domain, kind) -> token of its only live heap entry
+        self._wake = None
+        for domain in domains:
+            self.add(domain)
+
+    def add(self, domain):
+        """Start watching a domain, resuming its stored schedule if there is one.
+
+        Returns False, and watches nothing, if the name is not a valid domain.
+        """
+        domain = domain.strip().rstrip(".").lower()
+        if not valid_domain(domain):
+            return False
+        if domain in self.domains:
+            return True
+        self.domains.add(domain)
+        for kind in ("dns", "whois"):
+            stored = self.snapshots.get(f"{kind}:{domain}")
+            self._schedule(domain, kind, stored["next_due"] if stored else time.time())
+        if self._wake:
+            self._wake.set()
+        return True
+
+    def remove(self, domain):
+        """Stop watching a domain; its queued checks are dropped when they come due."""
+        domain = domain.strip().rstrip(".").lower()
+        self.domains.discard(domain)
+        for kind in ("dns", "whois"):
+            self._tokens.pop((domain, kind), None)
+
+    def _schedule(self, domain, kind, due):
+        """Queue the next check; it replaces any check already queued for this domain and kind."""
+        token = next(self._counter)
+        self._tokens[(domain, kind)] = token
+        heapq.heappush(self._heap, (due, token, domain, kind))
+
+    def _is_current(self, token, domain, kind):
+        return domain in self.domains and self._tokens.get((domain, kind)) == token
+
+    async def watch(self):
+        """Run forever, yielding a change event dict whenever a domain's DNS or WHOIS changes."""
+        self._wake = asyncio.Event()
+        while True:
+            if not self._heap:
+                await self._wake.wait()
+                self._wake.clear()
+                continue
+            wait = self._heap[0][0] - time.time()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            now = time.time()
+            due = {"dns": [], "whois": []}
+            while self._heap and self._heap[0][0] <= now and len(due["dns"]) + len(due["whois"]) < self.concurrency:
+                _, token, domain, kind = heapq.heappop(self._heap)
+                if self._is_current(token, domain, kind):
+                    due[kind].append(domain)
+
+            jobs = [("dns", [domain], self._refresh_dns(domain)) for domain in due["dns"]]
+            if due["whois"]:
+                jobs.append(("whois", due["whois"], self._refresh_whois(due["whois"])))
+            results = await asyncio.gather(*(job for _, _, job in jobs), return_exceptions=True)
+            for (kind, domains, _), events in zip(jobs, results):
+                if isinstance(events, Exception):
+                    # Keep these domains on the schedule instead of ending the watch
+                    self.stats["errors"] += 1
+                    for domain in domains:
+                        self._retry(domain, kind, time.time() + self.min_interval)
+                    continue
+                for event in events:
+                    self.stats["events"] += 1
+                    yield event
+
+    async def run(self, duration=None):
+        """Watch until duration seconds pass (or forever), passing each event to on_change."""
+        async def consume():
+            async for event in self.watch():
+                if self.on_change:
+                    self.on_change(event)
+                else:
+                    print(event)
+        try:
+            await asyncio.wait_for(consume(), timeout=duration)
+        except asyncio.TimeoutError:
+            pass
+        return self.stats
+
+    async def _resolve(self, domain, record_type):
+        """Return (sorted values, ttl), ([], None) for no answer, None for NXDOMAIN, or UNKNOWN if the lookup failed."""
+        self.stats["dns_queries"] += 1
+        try:
+            answer = await self.resolver.resolve(domain, record_type)
+        except dns.resolver.NXDOMAIN:
+            return None
+        except dns.resolver.NoAnswer:
+            return [], None
+        except dns.exception.DNSException:
+            return UNKNOWN
+        return sorted(rdata.to_text() for rdata in answer), answer.rrset.ttl
+
+    async def _refresh_dns(self, domain):
+        answers = await asyncio.gather(*(self._resolve(domain, record_type) for record_type in self.record_types))
+        if any(answer is None for answer in answers):
+            snapshot = {"exists": False}
+            interval = self.negative_interval
+        elif any(answer is UNKNOWN for answer in answers):
+            # A failed lookup is not an empty record set; keep the last snapshot and ask again soon
+            self._retry(domain, "dns", time.time() + self.min_interval)
+            return []
+        else:
+            snapshot = {"exists": True}
+            ttls = []
+            for record_type, (values, ttl) in zip(self.record_types, answers):
+                snapshot[record_type] = values
+                if ttl is not None:
+                    ttls.append(ttl)
+            interval = min(ttls) if ttls else self.negative_interval
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        return self._store(domain, "dns", snapshot, ("exists",) + tuple(self.record_types), time.time() + interval)
+
+    async def _refresh_whois(self, domains):
+        self.stats["whois_queries"] += len(domains)
+        records = await self.bulk_whois.lookup_many(domains)
+        events = []
+        now = time.time()
+        for domain in domains:
+            record = records.get(domain) or {}
+            if "error" in record:
+                # Keep the last good snapshot and try again tomorrow
+                self._retry(domain, "whois", now + min(self.whois_interval, DAY))
+                continue
+            events.extend(self._store(domain, "whois", record, WHOIS_FIELDS, self._next_whois_check(record, now)))
+        return events
+
+    def _next_whois_check(self, record, now):
+        expires = _parse_date(record.get("expiration_date"))
+        if expires is None or not -EXPIRY_GRACE <= expires - now <= self.whois_interval:
+            return now + self.whois_interval
+        if now < expires < now + DAY:
+            # Also look right after the expiry moment itself
+            return max(expires, now + self.min_interval)
+        return now + DAY
+
+    def _retry(self, domain, kind, due):
+        """Schedule another check without touching the stored snapshot."""
+        key = f"{kind}:{domain}"
+        stored = self.snapshots.get(key)
+        if stored:
+            stored["next_due"] = due
+            self.snapshots.set(key, stored)
+        self._schedule(domain, kind, due)
+
+    def _store(self, domain, kind, snapshot, fields, next_due):
+        """Save a snapshot, schedule the next check and return change events."""
+        key = f"{kind}:{domain}"
+        stored = self.snapshots.get(key)
+        self.snapshots.set(key, {"snapshot": snapshot, "next_due": next_due})
+        self._schedule(domain, kind, next_due)
+        if not stored:
+            return []
+        changes = diff_snapshots(stored["snapshot"], snapshot, fields)
+        return [{"domain": domain, "kind": kind, "field": field, "time": time.time(), **change}
+                for field, change in changes.items()]
+
+# Example Usage
+if __name__ == "__main__":
+    monitor = DomainMonitor(["example.com", "example.org"])
+    print(asyncio.run(monitor.run(duration=60)))
@@ -1,80 +1,208 @@
 import requests
 import re
-import configparser
+import time
+import asyncio
+import aiohttp
+from cachestore import DiskCache
+from credentials import get_credentials
+from results import lookup_result
+from emailprefilter import EmailPrefilter
+from resilience import get_resilience, ProviderSkipped
+
+HUNTER_MAX_PAGE_SIZE = 100
 
 class EmailLeakSearch:
-    def __init__(self, proxy=None):
-        config = configparser.ConfigParser()
-        config.read("config.ini")
-        self.hunter_api_key = config.get("API_KEYS", "hunter_api_key", fallback=None)
-        self.hibp_api_key = config.get("API_KEYS", "hibp_api_key", fallback=None)
+    def __init__(self, proxy=None, credentials=None, resilience=None):
+        self.credentials = credentials if credentials else get_credentials()
+        self.resilience = resilience if resilience else get_resilience()
         self.proxy = {"http": proxy, "https": proxy} if proxy else None
+        self.page_cache = DiskCache("hunter_domain_search", max_age=7 * 24 * 3600)
+        self.prefilter = EmailPrefilter()
+
+    @property
+    def hunter_api_key(self):
+        return self.credentials.peek("hunter")
+
+    @property
+    def hibp_api_key(self):
+        return self.credentials.peek("hibp")
 
     def validate_email(self, email):
         """Validate email format."""
         pattern = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
         return re.match(pattern, email) is not None
 
+    def prefilter_emails(self, emails):
+        """Normalize, de-duplicate and MX-check a bulk list before spending paid lookups on it."""
+        return self.prefilter.filter_sync(emails)
+
+    @lookup_result("hibp", "breaches")
     def search_email_breaches(self, email):
         """Check if an email has been exposed in data breaches using HaveIBeenPwned API."""
         if not self.hibp_api_key:
             return "HIBP API key not configured."
         
         url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{email}"
-        headers = {
-            "hibp-api-key": self.hibp_api_key,
-            "User-Agent": "EmailLeakSearchTool"
-        }
         try:
-            response = requests.get(url, headers=headers, proxies=self.proxy)
+            response = self.resilience.call("hibp", lambda timeout: self.credentials.call("hibp", lambda key: requests.get(
+                url, headers={"hibp-api-key": key, "User-Agent": "EmailLeakSearchTool"}, proxies=self.proxy,
+                timeout=timeout)), idempotent=False)
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 404:
                 return "No breaches found."
             else:
                 return f"Error: {response.status_code}"
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Request failed: {e}"
 
+    @lookup_result("hunter", "email_finder")
     def search_email_sources(self, email):
         """Search for email sources using Hunter.io API."""
         if not self.hunter_api_key:
             return "Hunter API key not configured."
         
-        url = f"https://api.hunter.io/v2/email-finder?email={email}&api_key={self.hunter_api_key}"
+        url = "https://api.hunter.io/v2/email-finder"
         try:
-            response = requests.get(url, proxies=self.proxy)
+            response = self.resilience.call("hunter", lambda timeout: self.credentials.call("hunter", lambda key: requests.get(
+                url, params={"email": email, "api_key": key}, proxies=self.proxy, timeout=timeout)), idempotent=False)
             if response.status_code == 200:
                 return response.json()
             else:
                 return f"Error: {response.status_code}"
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Request failed: {e}"
 
+    @lookup_result("hunter", "domain_search")
     def search_domain_emails(self, domain):
         """Find all emails associated with a domain using Hunter.io API."""
         if not self.hunter_api_key:
             return "Hunter API key not configured."
         
-        url = f"https://api.hunter.io/v2/domain-search?domain={domain}&api_key={self.hunter_api_key}"
+        url = "https://api.hunter.io/v2/domain-search"
         try:
-            response = requests.get(url, proxies=self.proxy)
+            response = self.resilience.call("hunter", lambda timeout: self.credentials.call("hunter", lambda key: requests.get(
+                url, params={"domain": domain, "api_key": key}, proxies=self.proxy, timeout=timeout)), idempotent=False)
             if response.status_code == 200:
                 return response.json()
             else:
                 return f"Error: {response.status_code}"
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Request failed: {e}"
 
+    async def stream_domain_emails(self, domain, max_results=None, max_concurrency=5):
+        """Yield normalized Hunter.io email records for a domain, fetching pages concurrently.
+
+        Pages are always fetched at the maximum size and cached on disk by offset,
+        so an interrupted enumeration resumes without re-fetching pages it already
+        has, whatever max_results is; results are trimmed in memory. Failed pages
+        are yielded as records with an "error" key.
+        """
+        if not self.hunter_api_key:
+            return
+        semaphore = asyncio.Semaphore(max_concurrency)
+        yielded = 0
+
+        async with aiohttp.ClientSession() as session:
+            first_page = await self._fetch_domain_page(session, semaphore, domain, 0)
+            total = first_page.get("total", 0)
+            if max_results is not None:
+                total = min(total, max_results)
+
+            for record in first_page["records"]:
+                if max_results is not None and yielded >= max_results:
+                    return
+                yielded += 1
+                yield record
+
+            tasks = [asyncio.create_task(self._fetch_domain_page(session, semaphore, domain, offset))
+                     for offset in range(HUNTER_MAX_PAGE_SIZE, total, HUNTER_MAX_PAGE_SIZE)]
+            try:
+                for next_page in asyncio.as_completed(tasks):
+                    for record in (await next_page)["records"]:
+                        if max_results is not None and yielded >= max_results:
+                            return
+                        yielded += 1
+                        yield record
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def _fetch_domain_page(self, session, semaphore, domain, offset):
+        """Fetch one full-size page of Hunter.io domain-search results, using the page cache."""
+        cache_key = f"{domain.lower()}:{offset}"
+        cached = self.page_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        url = "https://api.hunter.io/v2/domain-search"
+        tried = set()
+        async with semaphore:
+            try:
+                self.resilience.check("hunter")
+            except ProviderSkipped as e:
+                return {"total": 0, "records": [{"error": str(e), "offset": offset}]}
+            timeout = aiohttp.ClientTimeout(total=self.resilience.deadline.timeout(self.resilience.timeout))
+            while True:
+                key = self.credentials.acquire("hunter", exclude=tried)
+                if key is None:
+                    return {"total": 0, "records": [{"error": "No Hunter API key available.", "offset": offset}]}
+                tried.add(key)
+                params = {"domain": domain, "limit": HUNTER_MAX_PAGE_SIZE, "offset": offset, "api_key": key}
+                start = time.perf_counter()
+                try:
+                    async with session.get(url, params=params, proxy=self.proxy["https"] if self.proxy else None,
+                                           timeout=timeout) as response:
+                        self.resilience.record("hunter", response.status < 500, time.perf_counter() - start)
+                        if self.credentials.report_response("hunter", key, response.status, response.headers):
+                            continue
+                        if response.status != 200:
+                            return {"total": 0, "records": [{"error": f"Error: {response.status}", "offset": offset}]}
+                        data = await response.json()
+                        break
+                except Exception as e:
+                    self.resilience.record("hunter", False)
+                    return {"total": 0, "records": [{"error": f"Request failed: {e}", "offset": offset}]}
+
+        page = {
+            "total": data.get("meta", {}).get("results", 0),
+            "records": [self._normalize_hunter_email(entry, domain) for entry in data.get("data", {}).get("emails", [])]
+        }
+        self.page_cache.set(cache_key, page)
+        return page
+
+    def _normalize_hunter_email(self, entry, domain):
+        return {
+            "email": entry.get("value"),
+            "domain": domain,
+            "type": entry.get("type"),
+            "confidence": entry.get("confidence"),
+            "first_name": entry.get("first_name"),
+            "last_name": entry.get("last_name"),
+            "position": entry.get("position"),
+            "department": entry.get("department"),
+            "sources": len(entry.get("sources") or [])
+        }
+
+    @lookup_result("psbdmp", "pastebin")
     def search_pastebin_leaks(self, email):
         """Check for leaked emails on Pastebin (unofficial method)."""
         url = f"https://psbdmp.ws/api/search/{email}"
         try:
-            response = requests.get(url, proxies=self.proxy)
+            response = self.resilience.call("psbdmp", lambda timeout: requests.get(
+                url, proxies=self.proxy, timeout=timeout))
             if response.status_code == 200:
                 return response.json()
             else:
                 return "No leaks found or access restricted."
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Request failed: {e}"
 
@@ -88,3 +216,8 @@ if __name__ == "__main__":
         print("Email Sources:", email_tool.search_email_sources(email))
         print("Pastebin Leaks:", email_tool.search_pastebin_leaks(email))
     print("Domain Emails:", email_tool.search_domain_emails(domain))
+
+    async def print_domain_emails():
+        async for record in email_tool.stream_domain_emails(domain, max_results=250):
+            print("Domain Email:", record)
+    asyncio.run(print_domain_emails())
@@ -0,0 +1,171 @@
+import asyncio
+import re
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+from cachestore import DiskCache
+
+EMAIL_PATTERN = re.compile(r'^[a-z0-9_.+-]{1,64}@(?=.{1,253}$)[a-z0-9-]{1,63}(\.[a-z0-9-]{1,63})+$')
+
+# Providers that deliver user+tag@ to user@, and the separator they use
+PLUS_TAG_SEPARATORS = {
+    "gmail.com": "+", "googlemail.com": "+", "outlook.com": "+", "hotmail.com": "+", "live.com": "+",
+    "icloud.com": "+", "me.com": "+", "fastmail.com": "+", "protonmail.com": "+", "proton.me": "+",
+    "yahoo.com": "-"
+}
+DOT_INSENSITIVE_PROVIDERS = {"gmail.com", "googlemail.com"}
+DOMAIN_ALIASES = {"googlemail.com": "gmail.com"}
+
+DISPOSABLE_DOMAINS = {
+    "mailinator.com", "guerrillamail.com", "guerrillamail.net", "sharklasers.com", "10minutemail.com",
+    "tempmail.com", "temp-mail.org", "throwawaymail.com", "yopmail.com", "trashmail.com",
+    "getnada.com", "dispostable.com", "maildrop.cc", "fakeinbox.com", "mintemail.com",
+    "mailnesia.com", "spamgourmet.com", "emailondeck.com", "mohmal.com", "moakt.com"
+}
+
+def normalize_email(address):
+    """Return (canonical address, domain), or None if the address is malformed.
+
+    Lowercases, strips plus-tags where the provider ignores them and removes
+    dots from Gmail local parts, so variants of one mailbox collapse together.
+    """
+    address = address.strip().lower()
+    if not EMAIL_PATTERN.match(address):
+        return None
+    local, _, domain = address.rpartition("@")
+    domain = DOMAIN_ALIASES.get(domain, domain)
+    separator = PLUS_TAG_SEPARATORS.get(domain)
+    if separator:
+        local = local.split(separator, 1)[0]
+    if domain in DOT_INSENSITIVE_PROVIDERS:
+        local = local.replace(".", "")
+    if not local:
+        return None
+    return f"{local}@{domain}", domain
+
+class EmailPrefilter:
+    """Cut a bulk address list down to deliverable mailboxes before any paid lookup.
+
+    Addresses are normalized, de-duplicated and grouped by domain, so each
+    domain is checked once however many addresses share it. MX answers are
+    cached in memory and on disk. Addresses on disposable domains, domains
+    that do not exist and domains with a null MX or no mail host are dropped.
+    """
+    def __init__(self, disposable_domains=None, concurrency=100, cache_ttl=7 * 24 * 3600):
+        self.disposable_domains = set(disposable_domains) if disposable_domains else set(DISPOSABLE_DOMAINS)
+        self.concurrency = concurrency
+        self.cache = DiskCache("mx", max_age=cache_ttl)
+        self.resolver = dns.asyncresolver.Resolver()
+        self.resolver.lifetime = 10.0
+        self._mx = {}
+
+    @classmethod
+    def with_disposable_file(cls, path, **kwargs):
+        """Build a prefilter whose disposable list also includes one domain per line from a file."""
+        with open(path, "r") as f:
+            extra = {line.strip().lower() for line in f if line.strip() and not line.startswith("#")}
+        return cls(disposable_domains=DISPOSABLE_DOMAINS | extra, **kwargs)
+
+    def group(self, addresses):
+        """Normalize and de-duplicate addresses; return ({domain: [canonical]}, {original: reason})."""
+        by_domain = {}
+        rejected = {}
+        seen = set()
+        for original in addresses:
+            normalized = normalize_email(original)
+            if normalized is None:
+                rejected[original] = "malformed"
+                continue
+            canonical, domain = normalized
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+            if domain in self.disposable_domains:
+                rejected[original] = "disposable domain"
+                continue
+            by_domain.setdefault(domain, []).append(canonical)
+        return by_domain, rejected
+
+    async def filter(self, addresses):
+        """Return {"deliverable": {domain: [addresses]}, "rejected": {address: reason}, "stats": {...}}."""
+        by_domain, rejected = self.group(addresses)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        domains = list(by_domain)
+        verdicts = await asyncio.gather(*(self.mail_hosts(domain, semaphore) for domain in domains),
+                                        return_exceptions=True)
+
+        deliverable = {}
+        for domain, hosts in zip(domains, verdicts):
+            # Keep domains that could not be checked rather than drop real mailboxes
+            if hosts is None or isinstance(hosts, Exception) or (isinstance(hosts, list) and hosts):
+                deliverable[domain] = by_domain[domain]
+            else:
+                reason = hosts if isinstance(hosts, str) else "no mail server"
+                rejected.update((address, reason) for address in by_domain[domain])
+        return {
+            "deliverable": deliverable,
+            "rejected": rejected,
+            "stats": {
+                "domains": len(domains),
+                "deliverable": sum(len(group) for group in deliverable.values()),
+                "rejected": len(rejected)
+            }
+        }
+
+    def filter_sync(self, addresses):
+        """Blocking wrapper around filter."""
+        return asyncio.run(self.filter(addresses))
+
+    async def mail_hosts(self, domain, semaphore=None):
+        """Return the domain's mail hosts, [] if it accepts no mail, or a rejection reason string.
+
+        Returns None, uncached, when the lookup itself failed and deliverability is unknown.
+        """
+        if domain in self._mx:
+            return self._mx[domain]
+        cached = self.cache.get(domain)
+        if cached is None:
+            if semaphore:
+                async with semaphore:
+                    cached = await self._resolve_mx(domain)
+            else:
+                cached = await self._resolve_mx(domain)
+            if cached is None:
+                return None
+            self.cache.set(domain, cached)
+        self._mx[domain] = cached
+        return cached
+
+    async def _resolve_mx(self, domain):
+        try:
+            answer = await self.resolver.resolve(domain, "MX")
+            hosts = sorted((rdata.preference, rdata.exchange.to_text().rstrip(".")) for rdata in answer)
+            # RFC 7505 null MX: the domain explicitly accepts no mail
+            return [host for _, host in hosts if host]
+        except dns.resolver.NXDOMAIN:
+            return "domain does not exist"
+        except dns.resolver.NoAnswer:
+            pass
+        except dns.exception.DNSException:
+            return None
+        # No MX record: mail falls back to the domain's own address (RFC 5321)
+        for record_type in ("A", "AAAA"):
+            try:
+                await self.resolver.resolve(domain, record_type)
+                return [domain]
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                continue
+            except dns.exception.DNSException:
+                return None
+        return []
+
+# Example Usage
+if __name__ == "__main__":
+    prefilter = EmailPrefilter()
+    result = prefilter.filter_sync([
+        "John.Doe+news@Gmail.com", "johndoe@googlemail.com", "someone@mailinator.com",
+        "info@example.com", "broken@", "user@no-such-domain-osint-test.com"
+    ])
+    print("Deliverable:", result["deliverable"])
+    print("Rejected:", result["rejected"])
+    print("Stats:", result["stats"])
@@ -0,0 +1,157 @@
+import hashlib
+import random
+import re
+
+DOMAIN_PATTERN = re.compile(r'^(?=.{1,253}$)([a-z0-9-]{1,63}\.)+[a-z]{2,63}$')
+SEPARATORS = re.compile(r'[._\-+\s]')
+SECOND_LEVEL_LABELS = {"co", "com", "org", "net", "ac", "gov", "edu", "ne", "or"}
+MERSENNE_PRIME = (1 << 61) - 1
+# Attributes whose values name the same identity as the node; labels such as type, status or source never do
+IDENTITY_ATTRIBUTES = ("email", "username", "domain", "handle")
+ROLE_ACCOUNTS = {
+    "abuse", "accounts", "admin", "administrator", "billing", "careers", "contact", "enquiries", "feedback",
+    "hello", "help", "helpdesk", "hostmaster", "hr", "info", "jobs", "legal", "mail", "marketing", "media",
+    "noreply", "no-reply", "office", "postmaster", "press", "privacy", "root", "sales", "security", "service",
+    "support", "team", "webmaster"
+}
+DISTINCTIVE_LENGTH = 10
+CROSS_DOMAIN_WEIGHT = 0.5  # Same non-distinctive local part at two different email domains
+
+def identity_token(value):
+    """Return (core, email domain or None, distinctive) for an email, username or domain, or None.
+
+    Role mailboxes such as info@ or support@ name a function, not a person, and
+    are dropped. A core is distinctive when its source had a separator or digits
+    (john.doe, jdoe84) or is long; bare first names are not.
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip().lower()
+    if not value or len(value) > 64 or " " in value or value.startswith(("http://", "https://")):
+        return None
+    scope = None
+    if "@" in value and not value.startswith("@"):
+        local, _, scope = value.partition("@")
+        local = local.split("+", 1)[0]
+        if local in ROLE_ACCOUNTS:
+            return None
+        raw = local
+    elif DOMAIN_PATTERN.match(value):
+        labels = value.split(".")
+        second_level_suffix = len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_LABELS
+        raw = labels[-3] if len(labels) > 2 and second_level_suffix else labels[-2]
+    else:
+        raw = value.lstrip("@")
+    core = SEPARATORS.sub("", raw).rstrip("0123456789")
+    if len(core) < 3 or core.isdigit() or (scope and core in ROLE_ACCOUNTS):
+        return None
+    distinctive = core != raw or len(core) >= DISTINCTIVE_LENGTH
+    return core, scope, distinctive
+
+def normalize_identity(value):
+    """Reduce an email, username or domain to its comparable core, or None.
+
+    john.doe@gmail.com, johndoe and john_doe123 all reduce to "johndoe".
+    """
+    token = identity_token(value)
+    return token[0] if token else None
+
+def shingles(core, size=3):
+    padded = f"^{core}$"
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+class MinHashLSH:
+    """MinHash signatures banded into buckets so only likely-similar items are compared."""
+    def __init__(self, num_perm=64, bands=16, seed=42):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)]
+        self.bands = bands
+        self.rows = num_perm // bands
+
+    def signature(self, items):
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in items]
+        return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self.params]
+
+    def band_keys(self, items):
+        signature = self.signature(items)
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+class EntityResolver:
+    """Incrementally link near-duplicate identities without comparing every pair.
+
+    Each node contributes identity tokens: its key plus the values of its
+    IDENTITY_ATTRIBUTES. Equal cores score 1.0, except that a short,
+    undecorated local part shared by emails at different domains (john@a.com,
+    john@b.com) is scored at CROSS_DOMAIN_WEIGHT. Tokens are indexed by exact normalized core and by
+    MinHash-LSH bands over character trigrams, and a new node is compared only
+    with nodes sharing a bucket. Oversized buckets are capped, so linking stays
+    near-linear.
+    """
+    def __init__(self, threshold=0.6, num_perm=64, bands=16, max_bucket=200):
+        self.threshold = threshold
+        self.max_bucket = max_bucket
+        self.lsh = MinHashLSH(num_perm=num_perm, bands=bands)
+        self.buckets = {}
+        self.node_shingles = {}
+
+    def identity_tokens(self, entity, attributes=None):
+        """Return {core: (scopes, distinctive)}; scopes holds email domains, or None for other identities."""
+        attributes = attributes or {}
+        values = [entity] + [attributes[name] for name in IDENTITY_ATTRIBUTES if isinstance(attributes.get(name), str)]
+        tokens = {}
+        for token in map(identity_token, values):
+            if token:
+                core, scope, distinctive = token
+                scopes, was_distinctive = tokens.get(core, (set(), False))
+                tokens[core] = (scopes | {scope}, was_distinctive or distinctive)
+        return tokens
+
+    def add(self, entity, attributes=None):
+        """Index a node and return [(other_entity, similarity)] for new candidate links."""
+        tokens = self.identity_tokens(entity, attributes)
+        known = self.node_shingles.setdefault(entity, {})
+        candidates = {}
+        for core, (scopes, distinctive) in tokens.items():
+            if core in known:
+                known[core]["scopes"] |= scopes
+                known[core]["distinctive"] |= distinctive
+                continue
+            grams = shingles(core)
+            known[core] = {"grams": grams, "scopes": scopes, "distinctive": distinctive}
+            keys = [("core", core)] + self.lsh.band_keys(grams)
+            for key in keys:
+                bucket = self.buckets.setdefault(key, [])
+                for other in bucket:
+                    if other != entity and other not in candidates:
+                        candidates[other] = None
+                if len(bucket) < self.max_bucket and (not bucket or bucket[-1] != entity):
+                    bucket.append(entity)
+
+        links = []
+        for other in candidates:
+            score = max(
+                self.similarity(core, mine, other_core, theirs)
+                for core, mine in known.items()
+                for other_core, theirs in self.node_shingles[other].items()
+            )
+            if score >= self.threshold:
+                links.append((other, round(score, 3)))
+        return links
+
+    @staticmethod
+    def similarity(core, mine, other_core, theirs):
+        """Trigram similarity of two tokens, discounted when only their email domains differ."""
+        score = 1.0 if core == other_core else jaccard(mine["grams"], theirs["grams"])
+        cross_domain = None not in mine["scopes"] and None not in theirs["scopes"] and not mine["scopes"] & theirs["scopes"]
+        if cross_domain and not (mine["distinctive"] or theirs["distinctive"]):
+            score *= CROSS_DOMAIN_WEIGHT
+        return score
+
+# Example Usage
+if __name__ == "__main__":
+    resolver = EntityResolver()
+    for identity in ["john.doe@gmail.com", "johndoe", "john_doe123", "jane.smith@example.com", "jsmith", "johndoe.com"]:
+        print(identity, "->", resolver.add(identity))
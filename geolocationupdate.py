@@ -1,55 +1,82 @@
 import requests
 import socket
 import time
-import configparser
+from singleflight import SingleFlight
+from credentials import get_credentials
+from results import lookup_result, ptr_payload
+from resilience import get_resilience, ProviderSkipped
 
 class GeolocationIPAnalysis:
-    def __init__(self, config_path="config.ini", proxy=None):
-        config = configparser.ConfigParser()
-        config.read(config_path)
-        
-        self.maxmind_api_key = config.get("API_KEYS", "MAXMIND_API_KEY", fallback=None)
-        self.ip_quality_api_key = config.get("API_KEYS", "IPQUALITYSCORE_API_KEY", fallback=None)
-        self.historical_api_key = config.get("API_KEYS", "HISTORICAL_IP_API_KEY", fallback=None)
+    def __init__(self, config_path="config.ini", proxy=None, flight=None, credentials=None, resilience=None):
+        self.credentials = credentials if credentials else get_credentials(config_path)
+        self.resilience = resilience if resilience else get_resilience()
         self.proxy = {"http": proxy, "https": proxy} if proxy else None
+        self.flight = flight if flight else SingleFlight()
+
+    @property
+    def maxmind_api_key(self):
+        return self.credentials.peek("maxmind")
+
+    @property
+    def ip_quality_api_key(self):
+        return self.credentials.peek("ipqualityscore")
 
+    @property
+    def historical_api_key(self):
+        return self.credentials.peek("historical_ip")
+
+    @lookup_result("maxmind", "city")
     def get_ip_location(self, ip):
         """Retrieve geolocation data for an IP using MaxMind API."""
         if not self.maxmind_api_key:
             return "MaxMind API key not configured."
         
-        url = f"https://geoip.maxmind.com/geoip/v2.1/city/{ip}?key={self.maxmind_api_key}"
+        url = f"https://geoip.maxmind.com/geoip/v2.1/city/{ip}"
         try:
-            response = requests.get(url, proxies=self.proxy)
+            response = self.resilience.call("maxmind", lambda timeout: self.credentials.call("maxmind", lambda key: requests.get(
+                url, params={"key": key}, proxies=self.proxy, timeout=timeout)), idempotent=False)
             return response.json() if response.status_code == 200 else f"Error: {response.status_code}"
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Request failed: {e}"
 
+    @lookup_result("iptoasn", "asn")
     def get_ip_asn(self, ip):
         """Retrieve ASN (Autonomous System Number) details for an IP."""
         url = f"https://api.iptoasn.com/v1/as/ip/{ip}"
         try:
-            response = requests.get(url, proxies=self.proxy)
+            response = self.resilience.call("iptoasn", lambda timeout: requests.get(
+                url, proxies=self.proxy, timeout=timeout))
             return response.json() if response.status_code == 200 else f"Error: {response.status_code}"
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Request failed: {e}"
 
+    @lookup_result("dns", "ptr", normalize=ptr_payload)
     def reverse_dns_lookup(self, ip):
         """Perform reverse DNS lookup on an IP address."""
+        return self.flight.do("dns_ptr", ip, self._reverse_dns, ip)
+
+    def _reverse_dns(self, ip):
         try:
             return socket.gethostbyaddr(ip)
         except socket.herror:
             return "No reverse DNS record found."
 
+    @lookup_result("ipqualityscore", "proxy_check")
     def check_vpn_proxy(self, ip):
         """Check if an IP is associated with a VPN or proxy using IPQualityScore API."""
         if not self.ip_quality_api_key:
             return "IPQualityScore API key not configured."
         
-        url = f"https://www.ipqualityscore.com/api/json/ip/{self.ip_quality_api_key}/{ip}"
         try:
-            response = requests.get(url, proxies=self.proxy)
+            response = self.resilience.call("ipqualityscore", lambda timeout: self.credentials.call("ipqualityscore", lambda key: requests.get(
+                f"https://www.ipqualityscore.com/api/json/ip/{key}/{ip}", proxies=self.proxy, timeout=timeout)), idempotent=False)
             return response.json() if response.status_code == 200 else f"Error: {response.status_code}"
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Request failed: {e}"
 
@@ -57,18 +84,23 @@ class GeolocationIPAnalysis:
         """Retrieve IP reputation score from IPQualityScore API."""
         return self.check_vpn_proxy(ip)
     
+    @lookup_result("historical_ip", "history")
     def get_historical_ip_data(self, ip):
         """Retrieve historical geolocation data for an IP."""
         if not self.historical_api_key:
             return "Historical IP API key not configured."
         
-        url = f"https://historical-ip-api.example.com/v1/{ip}?key={self.historical_api_key}"
+        url = f"https://historical-ip-api.example.com/v1/{ip}"
         try:
-            response = requests.get(url, proxies=self.proxy)
+            response = self.resilience.call("historical_ip", lambda timeout: self.credentials.call("historical_ip", lambda key: requests.get(
+                url, params={"key": key}, proxies=self.proxy, timeout=timeout)), idempotent=False)
             return response.json() if response.status_code == 200 else f"Error: {response.status_code}"
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Request failed: {e}"
 
+    @lookup_result("maxmind", "tracking")
     def track_ip_real_time(self, ip, interval=10, duration=60):
         """Track an IP's geolocation in real-time for a specified duration."""
         if not self.maxmind_api_key:
@@ -3,6 +3,7 @@ import configparser
 import os
 
 CONFIG_FILE = "config.ini"
+MULTI_KEY_HELP = "Separate several keys with commas to spread requests across their quotas."
 
 def load_config():
     """Load existing configuration or create a new one if not found."""
@@ -56,11 +57,11 @@ def main():
     
     # API keys for general APIs
     openai_key = st.text_input("OpenAI API Key", config['API_KEYS'].get('openai_api_key', ''))
-    shodan_key = st.text_input("Shodan API Key", config['API_KEYS'].get('shodan_api_key', ''))
-    hibp_key = st.text_input("HaveIBeenPwned API Key", config['API_KEYS'].get('hibp_api_key', ''))
-    hunter_key = st.text_input("Hunter.io API Key", config['API_KEYS'].get('hunter_api_key', ''))
-    maxmind_key = st.text_input("MaxMind API Key", config['API_KEYS'].get('maxmind_api_key', ''))
-    ipquality_key = st.text_input("IPQualityScore API Key", config['API_KEYS'].get('ipqualityscore_api_key', ''))
+    shodan_key = st.text_input("Shodan API Key", config['API_KEYS'].get('shodan_api_key', ''), help=MULTI_KEY_HELP)
+    hibp_key = st.text_input("HaveIBeenPwned API Key", config['API_KEYS'].get('hibp_api_key', ''), help=MULTI_KEY_HELP)
+    hunter_key = st.text_input("Hunter.io API Key", config['API_KEYS'].get('hunter_api_key', ''), help=MULTI_KEY_HELP)
+    maxmind_key = st.text_input("MaxMind API Key", config['API_KEYS'].get('maxmind_api_key', ''), help=MULTI_KEY_HELP)
+    ipquality_key = st.text_input("IPQualityScore API Key", config['API_KEYS'].get('ipqualityscore_api_key', ''), help=MULTI_KEY_HELP)
     
     # API keys for Twitter
     twitter_api_key = st.text_input("Twitter API Key", config['Twitter'].get('api_key', ''))
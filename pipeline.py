@@ -0,0 +1,157 @@
+import asyncio
+import copy
+from geolocationupdate import GeolocationIPAnalysis
+from domainlookupupdate import DomainLookup
+from emaillookupupdate import EmailLeakSearch
+from usernamelookup import UsernameLookup
+from socialmediaupdate import SocialMediaOSINT
+from socialengine import SocialLookupEngine
+from corelationsupdate import DataCorrelation
+from singleflight import SingleFlight
+from credentials import get_credentials
+from proxypool import ProxyPool
+from resilience import Deadline, get_resilience
+from results import LookupResult, SKIPPED
+
+SOCIAL_LABELS = {"twitter": "Twitter Data", "reddit": "Reddit Data",
+                 "instagram": "Instagram Data", "linkedin": "LinkedIn Data"}
+
+class OSINTTools:
+    """One set of lookup tools shared by every investigation in a process.
+
+    Sharing the instances shares their key pools, single-flight results,
+    proxy pool, rate limiters and circuit breakers between concurrent runs.
+    Use for_run() to give one run its own deadline and call counts.
+    """
+    def __init__(self, credentials=None, flight=None, proxy_pool=None, resilience=None):
+        self.credentials = credentials if credentials else get_credentials()
+        self.flight = flight if flight else SingleFlight()
+        self.proxy_pool = proxy_pool
+        self.resilience = resilience if resilience else get_resilience()
+        self.geo = GeolocationIPAnalysis(flight=self.flight, credentials=self.credentials, resilience=self.resilience)
+        self.domain = DomainLookup(flight=self.flight, credentials=self.credentials, resilience=self.resilience)
+        self.email = EmailLeakSearch(credentials=self.credentials, resilience=self.resilience)
+        self.username = UsernameLookup(flight=self.flight, proxy_pool=proxy_pool, resilience=self.resilience)
+        self.social = SocialMediaOSINT(credentials=self.credentials, proxy_pool=proxy_pool, resilience=self.resilience)
+        self.social_engine = SocialLookupEngine(self.social)
+
+    @classmethod
+    def from_config(cls, config_path="config.ini"):
+        """Build the tools from config.ini, starting the proxy pool if one is configured."""
+        credentials = get_credentials(config_path)
+        proxy_pool = ProxyPool.from_config(credentials)
+        if len(proxy_pool):
+            proxy_pool.start()
+        else:
+            proxy_pool = None
+        return cls(credentials=credentials, proxy_pool=proxy_pool)
+
+    def for_run(self, deadline=None, hedge=None):
+        """A view of the tools for one run, with its own deadline, skipped list and single-flight counts."""
+        run = copy.copy(self)
+        run.resilience = self.resilience.with_deadline(deadline, hedge=hedge)
+        run.flight = self.flight.view()
+        for name in ("geo", "domain", "email", "username", "social"):
+            tool = copy.copy(getattr(self, name))
+            if hasattr(tool, "resilience"):
+                tool.resilience = run.resilience
+            if hasattr(tool, "flight"):
+                tool.flight = run.flight
+            setattr(run, name, tool)
+        run.social_engine = copy.copy(self.social_engine)
+        run.social_engine.social_tool = run.social
+        return run
+
+    def close(self):
+        """Stop the proxy pool's health checks; call once when the tools are no longer needed."""
+        if self.proxy_pool:
+            self.proxy_pool.close()
+
+async def _step(label, target, func, deadline):
+    """Run one lookup, in a thread unless it is a coroutine, and return [(label, result)]."""
+    try:
+        call = func(target) if asyncio.iscoroutinefunction(func) else asyncio.to_thread(func, target)
+        return [(label, await asyncio.wait_for(call, timeout=deadline.remaining()))]
+    except asyncio.TimeoutError:
+        return [(label, LookupResult("pipeline", label, target, SKIPPED, error="Skipped: run deadline reached"))]
+
+async def _social_step(tools, username, deadline):
+    try:
+        found = await asyncio.wait_for(asyncio.to_thread(tools.social_engine.lookup_many, [username]),
+                                       timeout=deadline.remaining())
+    except asyncio.TimeoutError:
+        return [(label, LookupResult("pipeline", label, username, SKIPPED, error="Skipped: run deadline reached"))
+                for label in SOCIAL_LABELS.values()]
+    return [(SOCIAL_LABELS[platform], result) for platform, result in found.get(username, {}).items()]
+
+async def investigate(tools, ip=None, domain=None, email=None, username=None, deadline=None, correlation=None):
+    """Run every lookup for the given inputs concurrently, yielding (label, result) as each finishes.
+
+    Pass tools.for_run(deadline) so provider calls share the run's deadline.
+    Lookups still running when the deadline passes are yielded as skipped
+    results, and closing or cancelling the generator cancels the rest. When
+    more than one input is given, the results are correlated and the anomalies
+    are yielded last under "Anomalies Detected".
+    """
+    deadline = Deadline(deadline)
+    steps = []
+    if ip:
+        steps += [("IP Info", ip, tools.geo.get_ip_location), ("ASN Info", ip, tools.geo.get_ip_asn),
+                  ("Reverse DNS", ip, tools.geo.reverse_dns_lookup)]
+    if domain:
+        steps += [("Domain IP", domain, tools.domain.get_ip), ("WHOIS Info", domain, tools.domain.get_whois),
+                  ("DNS Records", domain, tools.domain.get_dns_records)]
+    if email:
+        steps += [("Email Breaches", email, tools.email.search_email_breaches),
+                  ("Email Sources", email, tools.email.search_email_sources)]
+    if username:
+        steps += [("Username Lookup", username, tools.username.lookup)]
+
+    tasks = [asyncio.create_task(_step(label, target, func, deadline)) for label, target, func in steps]
+    if username:
+        tasks.append(asyncio.create_task(_social_step(tools, username, deadline)))
+
+    results = {}
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for label, result in await finished:
+                results[label] = result
+                yield label, result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if sum(bool(x) for x in [ip, domain, email, username]) > 1 and not deadline.expired:
+        correlation = correlation if correlation else DataCorrelation(credentials=tools.credentials)
+        if username:
+            correlation.add_data_point(username, {"email": email, "ip": ip})
+        if email:
+            correlation.add_data_point(email, {"breaches": results.get("Email Breaches"), "sources": results.get("Email Sources")})
+        if ip:
+            correlation.add_data_point(ip, {"asn_info": results.get("ASN Info"), "reverse_dns": results.get("Reverse DNS")})
+        if domain:
+            correlation.add_data_point(domain, {"whois": results.get("WHOIS Info"), "dns_records": results.get("DNS Records")})
+
+        if username and email:
+            correlation.add_relationship(username, email, "email_association")
+        if username and ip:
+            correlation.add_relationship(username, ip, "ip_association")
+        if username and domain:
+            correlation.add_relationship(username, domain, "domain_association")
+
+        try:
+            anomalies = await asyncio.to_thread(correlation.detect_anomalies)
+        except Exception as e:
+            anomalies = f"Error: {e}"
+        yield "Anomalies Detected", anomalies if isinstance(anomalies, str) else [str(entity) for entity in anomalies]
+
+# Example Usage
+if __name__ == "__main__":
+    async def main():
+        tools = OSINTTools.from_config()
+        try:
+            async for label, result in investigate(tools.for_run(60), ip="8.8.8.8", domain="example.com", deadline=60):
+                print(label, result)
+        finally:
+            tools.close()
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+from urllib.parse import urlsplit
+
+FOUND = "Profile found"
+NOT_FOUND = "Profile not found"
+# Statuses that say the site refused or failed to answer, not that the profile is missing
+BLOCKED_STATUSES = {401, 403, 407, 429}
+
+# Per-site byte signatures seen near the top of profile pages. "negative" marks
+# a missing user on sites that still answer 200; "positive" confirms a profile.
+SITE_SIGNATURES = {
+    "github.com": {
+        "negative": ["<title>page not found"],
+        "positive": ['itemtype="http://schema.org/person"', "p-nickname"]
+    },
+    "reddit.com": {
+        "negative": ["sorry, nobody on reddit goes by that name", "page not found"],
+        "positive": ['"profile-']
+    },
+    "instagram.com": {
+        "negative": ["page not found", "sorry, this page isn't available"],
+        "positive": ['"profilepage', "og:type\" content=\"profile"]
+    },
+    "tiktok.com": {
+        "negative": ["couldn't find this account", "user-not-found"],
+        "positive": ['"uniqueid":"']
+    },
+    "pinterest.com": {
+        "negative": ["user not found"],
+        "positive": ["pinterestapp:pinners", "og:type\" content=\"profile"]
+    },
+    "medium.com": {
+        "negative": ["page not found", "out of nothing, something."],
+        "positive": ['"@type":"person"']
+    },
+    "steamcommunity.com": {
+        "negative": ["the specified profile could not be found"],
+        "positive": ["profile_header", "actual_persona_name"]
+    },
+    "soundcloud.com": {
+        "negative": ["we can't find that user"],
+        "positive": ['"kind":"user"']
+    },
+    "vimeo.com": {
+        "negative": ["sorry, we couldn", "page not found"],
+        "positive": ['"@type":"person"']
+    },
+    "linkedin.com": {
+        "negative": ["page not found", "profile not found", "this page doesn"],
+        "positive": ['"@type":"person"', "og:type\" content=\"profile"]
+    }
+}
+
+def status_verdict(status):
+    """Verdict from the status alone: None to read the body, an error for blocked or failed requests."""
+    if status == 200:
+        return None
+    if status in BLOCKED_STATUSES or status >= 500:
+        return f"Error: HTTP {status}"
+    return NOT_FOUND
+
+def site_for(url):
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+class _Matcher:
+    """Scan a byte stream for signatures, keeping only a short overlap between chunks."""
+    def __init__(self, signatures):
+        self.negative = [s.encode("utf-8") for s in signatures.get("negative", [])]
+        self.positive = [s.encode("utf-8") for s in signatures.get("positive", [])]
+        self.overlap = max((len(s) for s in self.negative + self.positive), default=1) - 1
+        self.tail = b""
+
+    def feed(self, chunk):
+        window = self.tail + chunk.lower()
+        self.tail = window[-self.overlap:] if self.overlap else b""
+        # Negative signatures win, since "not found" pages often echo the username
+        if any(s in window for s in self.negative):
+            return NOT_FOUND
+        if any(s in window for s in self.positive):
+            return FOUND
+        return None
+
+class ProfileClassifier:
+    """Decide whether a profile exists while reading as little of the response as possible.
+
+    Non-200 responses are decided from the status alone; 401, 403, 407, 429
+    and 5xx say nothing about the profile and come back as "Error: HTTP <status>",
+    so they are neither cached nor reported as missing. For 200 responses the
+    body is read chunk by chunk and matched against the site's signatures; the
+    connection is dropped as soon as one matches, or after max_bytes. Sites with
+    no signatures, or pages where none match, fall back to the status code.
+    """
+    def __init__(self, signatures=None, max_bytes=256 * 1024, chunk_size=8192):
+        self.signatures = signatures if signatures else SITE_SIGNATURES
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self.early_stops = 0
+
+    def _matcher(self, url):
+        signatures = self.signatures.get(site_for(url))
+        return _Matcher(signatures) if signatures else None
+
+    def classify(self, url, response):
+        """Classify a requests response opened with stream=True, then close it."""
+        try:
+            verdict = status_verdict(response.status_code)
+            if verdict:
+                return verdict
+            matcher = self._matcher(url)
+            if matcher is None:
+                return FOUND
+            return self._scan(matcher, response.iter_content(self.chunk_size)) or FOUND
+        finally:
+            response.close()
+
+    async def classify_async(self, url, response):
+        """Classify an aiohttp response, reading the body only until a verdict is reached."""
+        verdict = status_verdict(response.status)
+        if verdict:
+            return verdict
+        matcher = self._matcher(url)
+        if matcher is None:
+            return FOUND
+        read = 0
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            read += len(chunk)
+            self.bytes_read += len(chunk)
+            verdict = matcher.feed(chunk)
+            if verdict or read >= self.max_bytes:
+                if verdict:
+                    self.early_stops += 1
+                response.close()
+                return verdict or FOUND
+        return FOUND
+
+    def _scan(self, matcher, chunks):
+        read = 0
+        for chunk in chunks:
+            read += len(chunk)
+            self.bytes_read += len(chunk)
+            verdict = matcher.feed(chunk)
+            if verdict:
+                self.early_stops += 1
+                return verdict
+            if read >= self.max_bytes:
+                return None
+        return None
+
+# Example Usage
+if __name__ == "__main__":
+    import requests
+    classifier = ProfileClassifier()
+    for url in ["https://github.com/jack", "https://github.com/this-user-should-not-exist-123456"]:
+        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, stream=True)
+        print(url, classifier.classify(url, response))
+    print("Bytes read:", classifier.bytes_read, "Early stops:", classifier.early_stops)
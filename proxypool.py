@@ -0,0 +1,175 @@
+import random
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+class ProxyStats:
+    """Measured health of one proxy."""
+    __slots__ = ("url", "latency", "successes", "failures", "consecutive_failures", "alive")
+
+    def __init__(self, url):
+        self.url = url
+        self.latency = 1.0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.alive = True
+
+    @property
+    def success_rate(self):
+        # Laplace smoothing so new proxies get a fair first chance
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    @property
+    def weight(self):
+        return self.success_rate / max(self.latency, 0.05)
+
+class ProxyPool:
+    """Pool of HTTP(S) proxies chosen by measured latency and success rate.
+
+    Each target site sticks to one proxy while it stays healthy. Proxies that
+    fail max_failures times in a row are dropped from rotation until a
+    background health check sees them working again.
+    """
+    def __init__(self, proxies=(), check_url="https://www.example.com/", check_interval=60,
+                 max_failures=3, timeout=10):
+        self.check_url = check_url
+        self.check_interval = check_interval
+        self.max_failures = max_failures
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._proxies = {}
+        self._assignments = {}
+        self._stop = threading.Event()
+        self._thread = None
+        for proxy in proxies:
+            self.add(proxy)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Load one proxy URL per line; blank lines and # comments are ignored."""
+        with open(path, "r") as f:
+            proxies = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        return cls(proxies, **kwargs)
+
+    @classmethod
+    def from_config(cls, credentials, **kwargs):
+        """Build a pool from the [Proxy] section: "pool" (comma-separated) and/or "pool_file"."""
+        section = credentials.section("Proxy")
+        proxies = [p.strip() for p in section.get("pool", "").split(",") if p.strip()]
+        if section.get("pool_file"):
+            proxies.extend(cls.from_file(section["pool_file"]).proxies())
+        for scheme in ("http", "https"):
+            if section.get(scheme):
+                proxies.append(section[scheme])
+        return cls(dict.fromkeys(proxies), **kwargs)
+
+    def add(self, proxy):
+        with self._lock:
+            self._proxies.setdefault(proxy, ProxyStats(proxy))
+
+    def proxies(self):
+        return list(self._proxies)
+
+    def __len__(self):
+        return len(self._proxies)
+
+    def choose(self, target):
+        """Return the proxy URL for a target URL or host, or None if no proxy is alive."""
+        site = urlsplit(target).hostname or target
+        with self._lock:
+            assigned = self._proxies.get(self._assignments.get(site))
+            if assigned is not None and assigned.alive:
+                return assigned.url
+            alive = [stats for stats in self._proxies.values() if stats.alive]
+            if not alive:
+                return None
+            chosen = random.choices(alive, weights=[stats.weight for stats in alive])[0]
+            self._assignments[site] = chosen.url
+            return chosen.url
+
+    def requests_proxies(self, target):
+        """Return a requests-style proxies dict for a target, or None."""
+        proxy = self.choose(target)
+        return {"http": proxy, "https": proxy} if proxy else None
+
+    def record(self, proxy, ok, latency=None):
+        """Feed back the outcome of a request made through a proxy."""
+        if proxy is None:
+            return
+        with self._lock:
+            stats = self._proxies.get(proxy)
+            if stats is None:
+                return
+            if ok:
+                stats.successes += 1
+                stats.consecutive_failures = 0
+                stats.alive = True
+                if latency is not None:
+                    stats.latency = 0.7 * stats.latency + 0.3 * latency
+            else:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                if stats.consecutive_failures >= self.max_failures:
+                    stats.alive = False
+
+    def check(self, proxy):
+        """Health-check one proxy against check_url and record the result."""
+        start = time.monotonic()
+        try:
+            response = requests.get(self.check_url, proxies={"http": proxy, "https": proxy}, timeout=self.timeout)
+            ok = response.status_code < 500
+        except requests.RequestException:
+            ok = False
+        self.record(proxy, ok, time.monotonic() - start)
+        return ok
+
+    def check_all(self, max_workers=20):
+        """Health-check every proxy concurrently."""
+        proxies = self.proxies()
+        if not proxies:
+            return {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(proxies, executor.map(self.check, proxies)))
+
+    def start(self):
+        """Start background health checks."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._health_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self, timeout=None):
+        """Stop background health checks and wait for the checker thread to exit."""
+        self.stop()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _health_loop(self):
+        while not self._stop.is_set():
+            self.check_all()
+            self._stop.wait(self.check_interval)
+
+    def status(self):
+        """Summarize every proxy's health for display."""
+        with self._lock:
+            return {stats.url: {
+                "alive": stats.alive,
+                "latency": round(stats.latency, 3),
+                "success_rate": round(stats.success_rate, 3)
+            } for stats in self._proxies.values()}
+
+# Example Usage
+if __name__ == "__main__":
+    pool = ProxyPool(["http://proxy-one:8080", "http://proxy-two:8080"])
+    print("Health Check:", pool.check_all())
+    print("Proxy for github.com:", pool.choose("https://github.com/jack"))
+    print("Pool Status:", pool.status())
+    pool.close()
@@ -0,0 +1,263 @@
+import copy
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_TIMEOUT = 15.0  # Seconds allowed for any single provider call
+
+class ProviderSkipped(Exception):
+    """Raised instead of calling a provider whose circuit is open or whose run is out of time."""
+    def __init__(self, provider, reason):
+        super().__init__(f"Skipped: {reason}")
+        self.provider = provider
+        self.reason = reason
+
+class Deadline:
+    """Point in time by which a whole run must finish; None means no limit."""
+    def __init__(self, seconds=None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self):
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, default):
+        """The per-call timeout, shortened so a call never outlives the deadline."""
+        remaining = self.remaining()
+        return default if remaining is None else min(default, remaining)
+
+class CircuitBreaker:
+    """Fail fast while a provider is down, letting one trial call through after a cool-off."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record(self, ok):
+        with self._lock:
+            if ok:
+                self.state = self.CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider."""
+    def __init__(self, window=200, min_samples=20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, fraction):
+        """Latency at the given fraction, or None until enough samples exist."""
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+class Resilience:
+    """Timeouts, deadlines, hedging and circuit breakers around provider calls.
+
+    Every call gets a timeout capped by the run's deadline. Idempotent calls that
+    run past the provider's p95 latency get one duplicate request, and whichever
+    answers first wins. Providers that keep failing trip their circuit breaker
+    and are skipped until it resets. Skipped calls raise ProviderSkipped so the
+    caller can record them and return partial results on time.
+
+    with_deadline() views share the breakers, latency history and hedging
+    threads of the instance they came from, but count their own stats; a view
+    made with hedge=False never sends duplicates.
+    """
+    def __init__(self, timeout=DEFAULT_TIMEOUT, failure_threshold=5, reset_timeout=30.0,
+                 hedge_percentile=0.95, min_samples=20, max_hedge_workers=16):
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.max_hedge_workers = max_hedge_workers
+        self.hedge = True
+        self.deadline = Deadline()
+        self.breakers = {}
+        self.latency = {}
+        self.skipped = []
+        self.stats = {"calls": 0, "hedged": 0, "failures": 0}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._root = self
+
+    def with_deadline(self, seconds, hedge=None):
+        """A view for one run: shares breakers and latency history but has its own deadline.
+
+        hedge=False turns hedging off for the view; None keeps the parent's setting.
+        """
+        run = copy.copy(self)
+        if hedge is not None:
+            run.hedge = hedge
+        run.deadline = Deadline(seconds)
+        run.skipped = []
+        run.stats = {"calls": 0, "hedged": 0, "failures": 0}
+        return run
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+            if self._root is not self:
+                self._root.stats[name] += 1
+
+    def _hedge_executor(self):
+        root = self._root
+        with root._lock:
+            if root._executor is None:
+                root._executor = ThreadPoolExecutor(max_workers=root.max_hedge_workers)
+            return root._executor
+
+    def close(self):
+        """Shut down the hedging threads; only the instance that created them owns them."""
+        if self._root is self and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def breaker(self, provider):
+        with self._lock:
+            if provider not in self.breakers:
+                self.breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[provider]
+
+    def tracker(self, provider):
+        with self._lock:
+            if provider not in self.latency:
+                self.latency[provider] = LatencyTracker(min_samples=self.min_samples)
+            return self.latency[provider]
+
+    def check(self, provider):
+        """Raise ProviderSkipped if the provider must not be called right now."""
+        if self.deadline.expired:
+            reason = "run deadline reached"
+        elif not self.breaker(provider).allow():
+            reason = f"circuit open for {provider}"
+        else:
+            return
+        self.skipped.append({"provider": provider, "reason": reason})
+        raise ProviderSkipped(provider, reason)
+
+    def record(self, provider, ok, elapsed=None):
+        """Report the outcome of a call made outside call(), e.g. over aiohttp."""
+        self.breaker(provider).record(ok)
+        if ok and elapsed is not None:
+            self.tracker(provider).add(elapsed)
+        if not ok:
+            self._count("failures")
+
+    def call(self, provider, send, idempotent=True):
+        """Call send(timeout) for a provider and return its result.
+
+        Responses with a 5xx status and raised exceptions count as failures
+        towards the provider's circuit breaker; exceptions are re-raised.
+        """
+        self.check(provider)
+        self._count("calls")
+        timeout = self.deadline.timeout(self.timeout)
+        hedge_after = self.tracker(provider).percentile(self.hedge_percentile) if idempotent and self.hedge else None
+        start = time.perf_counter()
+        try:
+            if hedge_after is None or hedge_after >= timeout:
+                response = send(timeout)
+            else:
+                response = self._hedged(send, timeout, hedge_after)
+        except Exception:
+            self.record(provider, False)
+            raise
+        status = getattr(response, "status_code", None)
+        self.record(provider, status is None or status < 500, time.perf_counter() - start)
+        return response
+
+    def _hedged(self, send, timeout, hedge_after):
+        executor = self._hedge_executor()
+        pending = {executor.submit(send, timeout)}
+        done, _ = wait(pending, timeout=hedge_after)
+        if not done:
+            self._count("hedged")
+            pending.add(executor.submit(send, self.deadline.timeout(max(timeout - hedge_after, 1.0))))
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = future.result()
+                    # Release the loser's connection, e.g. a stream=True response nobody will read
+                    for loser in done | pending:
+                        if loser is not future:
+                            loser.add_done_callback(_close_result)
+                    return winner
+                error = future.exception()
+        raise error
+
+    def status(self):
+        """Summarize breaker state and p95 latency per provider for display."""
+        return {provider: {
+            "state": breaker.state,
+            "failures": breaker.failures,
+            "p95": self.tracker(provider).percentile(self.hedge_percentile)
+        } for provider, breaker in list(self.breakers.items())}
+
+def _close_result(future):
+    if future.cancelled() or future.exception() is not None:
+        return
+    close = getattr(future.result(), "close", None)
+    if callable(close):
+        close()
+
+_shared = None
+
+def get_resilience():
+    """Return the process-wide Resilience so breakers and latency history are shared."""
+    global _shared
+    if _shared is None:
+        _shared = Resilience()
+    return _shared
+
+# Example Usage
+if __name__ == "__main__":
+    import requests
+    run = get_resilience().with_deadline(30)
+    for _ in range(3):
+        try:
+            response = run.call("iptoasn", lambda timeout: requests.get(
+                "https://api.iptoasn.com/v1/as/ip/8.8.8.8", timeout=timeout))
+            print(response.status_code)
+        except ProviderSkipped as e:
+            print(e)
+        except Exception as e:
+            print(f"Request failed: {e}")
+    print(run.status(), run.stats, run.skipped)
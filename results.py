@@ -0,0 +1,172 @@
+import functools
+import inspect
+import json
+import marshal
+import time
+from datetime import date, datetime
+
+OK = "ok"
+NOT_FOUND = "not_found"
+NOT_CONFIGURED = "not_configured"
+ERROR = "error"
+SKIPPED = "skipped"
+
+# Legacy return strings that mean "looked, nothing there" rather than failure
+NOT_FOUND_MESSAGES = {
+    "No breaches found.",
+    "No reverse DNS record found.",
+    "Could not resolve domain.",
+    "Domain does not exist.",
+    "No leaks found or access restricted.",
+    "No information available for that IP.",
+    "Profile not found",
+    "User not found."
+}
+ERROR_PREFIXES = ("Error", "Request failed", "Shodan Error", "Twitter API Error")
+
+class LookupResult:
+    """Compact record of one provider lookup: who was asked, what came back, how long it took."""
+    __slots__ = ("provider", "operation", "target", "status", "payload", "error", "elapsed", "timestamp")
+
+    def __init__(self, provider, operation, target, status=OK, payload=None, error=None, elapsed=0.0, timestamp=None):
+        self.provider = provider
+        self.operation = operation
+        self.target = target
+        self.status = status
+        self.payload = payload
+        self.error = error
+        self.elapsed = elapsed
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    @property
+    def ok(self):
+        return self.status == OK
+
+    def to_tuple(self):
+        return (self.provider, self.operation, self.target, self.status, self.payload,
+                self.error, self.elapsed, self.timestamp)
+
+    @classmethod
+    def from_tuple(cls, values):
+        return cls(*values)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def __eq__(self, other):
+        return isinstance(other, LookupResult) and self.to_tuple() == other.to_tuple()
+
+    def __repr__(self):
+        return f"LookupResult({self.provider}.{self.operation}, {self.target!r}, {self.status})"
+
+def normalize_payload(value):
+    """Convert library objects into plain JSON/marshal-safe values."""
+    if isinstance(value, LookupResult):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {str(k): normalize_payload(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [normalize_payload(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(normalize_payload(v) for v in value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def ptr_payload(value):
+    """Normalize a socket.gethostbyaddr tuple."""
+    if isinstance(value, tuple) and len(value) == 3:
+        return {"hostname": value[0], "aliases": list(value[1]), "addresses": list(value[2])}
+    return value
+
+def to_result(provider, operation, target, value, elapsed=0.0, normalize=None):
+    """Wrap a legacy return value (data, error string or None) in a LookupResult."""
+    if isinstance(value, LookupResult):
+        return value
+    if value is None:
+        return LookupResult(provider, operation, target, ERROR, error="No data returned.", elapsed=elapsed)
+    if isinstance(value, str):
+        if value.startswith("Skipped:"):
+            return LookupResult(provider, operation, target, SKIPPED, error=value, elapsed=elapsed)
+        if value.endswith("not configured."):
+            return LookupResult(provider, operation, target, NOT_CONFIGURED, error=value, elapsed=elapsed)
+        if value in NOT_FOUND_MESSAGES:
+            return LookupResult(provider, operation, target, NOT_FOUND, error=value, elapsed=elapsed)
+        if value.startswith(ERROR_PREFIXES):
+            return LookupResult(provider, operation, target, ERROR, error=value, elapsed=elapsed)
+    if normalize:
+        value = normalize(value)
+    return LookupResult(provider, operation, target, OK, normalize_payload(value), elapsed=elapsed)
+
+def lookup_result(provider, operation=None, normalize=None):
+    """Decorate a lookup method so it returns a LookupResult, timing the call."""
+    def decorator(func):
+        name = operation or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, target, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    value = await func(self, target, *args, **kwargs)
+                except Exception as e:
+                    value = f"Error: {e}"
+                return to_result(provider, name, target, value, time.perf_counter() - start, normalize)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, target, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                value = func(self, target, *args, **kwargs)
+            except Exception as e:
+                value = f"Error: {e}"
+            return to_result(provider, name, target, value, time.perf_counter() - start, normalize)
+        return wrapper
+    return decorator
+
+def to_jsonable(value):
+    """json.dumps default hook for LookupResult and library objects."""
+    if isinstance(value, LookupResult):
+        return value.to_dict()
+    return normalize_payload(value)
+
+def dumps(results):
+    """Serialize results to compact JSON bytes."""
+    return json.dumps(results, default=to_jsonable, separators=(",", ":")).encode("utf-8")
+
+def write_jsonl(results, fp):
+    """Stream results to a text file, one compact JSON object per line."""
+    for result in results:
+        fp.write(json.dumps(result.to_dict(), separators=(",", ":")))
+        fp.write("\n")
+
+def read_jsonl(fp):
+    for line in fp:
+        if line.strip():
+            yield LookupResult.from_dict(json.loads(line))
+
+def dumps_binary(results):
+    """Serialize results with marshal: several times faster than JSON.
+
+    The format is specific to the Python version, so use it for local spools
+    and caches between processes of the same install, not for interchange.
+    """
+    return marshal.dumps([result.to_tuple() for result in results])
+
+def loads_binary(data):
+    return [LookupResult.from_tuple(values) for values in marshal.loads(data)]
+
+# Example Usage
+if __name__ == "__main__":
+    result = to_result("hibp", "breaches", "user@example.com", "No breaches found.")
+    print(result, result.to_dict())
+    packed = dumps_binary([result])
+    print("Binary size:", len(packed), "JSON size:", len(dumps([result])))
+    print(loads_binary(packed)[0] == result)
@@ -0,0 +1,179 @@
+import ipaddress
+import socket
+import threading
+import time
+import shodan
+from concurrent.futures import ThreadPoolExecutor
+from cachestore import DiskCache
+
+NO_INFO = "No information available for that IP."
+
+class ShodanEnrichment:
+    """Enrich many domains with Shodan host data while spending as few credits as possible.
+
+    All pending domains are resolved first and their IPs de-duplicated, so hosts
+    shared by many domains (CDNs, shared hosting) are queried once. Dense /24
+    blocks use a single net: search, the rest use multi-IP host lookups, and
+    every call is paced to the account's rate limit. Host records are cached and
+    fanned back out to each domain that resolved to them; records assembled from
+    net: search banners are marked "source": "net_search" and cached separately,
+    since they are not full host lookups. IPs Shodan knows nothing about are
+    cached for the shorter negative_ttl. A multi-IP lookup that fails is split
+    in halves until the failing IPs are isolated.
+    """
+    def __init__(self, shodan_api, resolve=None, requests_per_second=1.0, batch_size=100,
+                 netblock_threshold=8, minify=False, cache_ttl=24 * 3600, negative_ttl=6 * 3600):
+        self.shodan_api = shodan_api
+        self.resolve = resolve if resolve else self._resolve_ip
+        self.min_interval = 1.0 / requests_per_second
+        self.batch_size = batch_size
+        self.netblock_threshold = netblock_threshold
+        self.minify = minify
+        self.cache = DiskCache("shodan_host", max_age=cache_ttl)
+        self.netblock_cache = DiskCache("shodan_netblock", max_age=cache_ttl)
+        self.missing_cache = DiskCache("shodan_missing", max_age=negative_ttl)
+        self._last_call = 0.0
+        self._throttle_lock = threading.Lock()
+        self.api_calls = 0
+
+    def enrich(self, domains):
+        """Return {domain: {"ip": ..., "shodan": host record or error}} for every domain."""
+        resolved = self._resolve_all(domains)
+        ips = {ip for ip in resolved.values() if ip}
+
+        hosts = {}
+        pending = []
+        for ip in ips:
+            cached = self.cache.get(ip)
+            if cached is None:
+                cached = self.netblock_cache.get(ip)
+            if cached is None:
+                cached = self.missing_cache.get(ip)
+            if cached is not None:
+                hosts[ip] = cached
+            else:
+                pending.append(ip)
+
+        if pending:
+            hosts.update(self._fetch_hosts(pending))
+
+        results = {}
+        for domain, ip in resolved.items():
+            if not ip:
+                results[domain] = {"ip": None, "shodan": "Could not resolve domain."}
+            else:
+                results[domain] = {"ip": ip, "shodan": hosts.get(ip, NO_INFO)}
+        return results
+
+    def _resolve_all(self, domains, max_workers=20):
+        unique = list(dict.fromkeys(domains))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            addresses = executor.map(self.resolve, unique)
+        resolved = {}
+        for domain, ip in zip(unique, addresses):
+            try:
+                ipaddress.ip_address(ip)
+                resolved[domain] = ip
+            except ValueError:
+                resolved[domain] = None
+        return resolved
+
+    def _resolve_ip(self, domain):
+        try:
+            return socket.gethostbyname(domain)
+        except socket.gaierror:
+            return "Could not resolve domain."
+
+    def _fetch_hosts(self, ips):
+        hosts = {}
+        blocks = {}
+        for ip in ips:
+            if ipaddress.ip_address(ip).version == 4:
+                block = str(ipaddress.ip_network(f"{ip}/24", strict=False))
+                blocks.setdefault(block, []).append(ip)
+
+        remaining = set(ips)
+        for block, members in blocks.items():
+            if len(members) < self.netblock_threshold:
+                continue
+            found = self._search_netblock(block)
+            if found is None:
+                continue
+            for ip in members:
+                hosts[ip] = found.get(ip, NO_INFO)
+                remaining.discard(ip)
+
+        remaining = sorted(remaining)
+        for start in range(0, len(remaining), self.batch_size):
+            batch = remaining[start:start + self.batch_size]
+            hosts.update(self._lookup_batch(batch))
+
+        for ip, record in hosts.items():
+            if isinstance(record, dict):
+                cache = self.netblock_cache if record.get("source") == "net_search" else self.cache
+                cache.set(ip, record)
+            elif record == NO_INFO:
+                self.missing_cache.set(ip, record)
+        return hosts
+
+    def _search_netblock(self, block):
+        """Fetch every host in a net block with one search; return None if not allowed."""
+        found = {}
+        page = 1
+        try:
+            while True:
+                self._throttle()
+                response = self.shodan_api.search(f"net:{block}", page=page, minify=self.minify)
+                for banner in response.get("matches", []):
+                    host = found.setdefault(banner["ip_str"], {
+                        "ip_str": banner["ip_str"],
+                        "org": banner.get("org"),
+                        "isp": banner.get("isp"),
+                        "asn": banner.get("asn"),
+                        "os": banner.get("os"),
+                        "hostnames": [],
+                        "ports": [],
+                        "data": [],
+                        "source": "net_search"
+                    })
+                    host["ports"] = sorted(set(host["ports"]) | {banner.get("port")})
+                    host["hostnames"] = sorted(set(host["hostnames"]) | set(banner.get("hostnames", [])))
+                    host["data"].append(banner)
+                if page * 100 >= response.get("total", 0):
+                    return found
+                page += 1
+        except shodan.APIError:
+            return None
+
+    def _lookup_batch(self, batch):
+        self._throttle()
+        try:
+            response = self.shodan_api.host(batch if len(batch) > 1 else batch[0], minify=self.minify)
+        except shodan.APIError as e:
+            if len(batch) == 1:
+                return {batch[0]: NO_INFO if NO_INFO in str(e) else f"Shodan Error: {e}"}
+            # One unknown IP fails the whole multi-IP request; halving finds it in a few calls
+            middle = len(batch) // 2
+            results = self._lookup_batch(batch[:middle])
+            results.update(self._lookup_batch(batch[middle:]))
+            return results
+        records = response if isinstance(response, list) else [response]
+        found = {record["ip_str"]: record for record in records if "ip_str" in record}
+        return {ip: found.get(ip, NO_INFO) for ip in batch}
+
+    def _throttle(self):
+        with self._throttle_lock:
+            wait = self._last_call + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_call = time.monotonic()
+            self.api_calls += 1
+
+# Example Usage
+if __name__ == "__main__":
+    from domainlookupupdate import DomainLookup
+    lookup_tool = DomainLookup()
+    if lookup_tool.shodan_api:
+        enrichment = lookup_tool.shodan_enrichment
+        print(enrichment.enrich(["example.com", "www.example.com", "example.org"]))
+        print("Shodan API calls:", enrichment.api_calls)
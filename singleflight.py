@@ -0,0 +1,182 @@
+import asyncio
+import copy
+import threading
+from urllib.parse import urlsplit, urlunsplit
+from results import LookupResult, ERROR, SKIPPED, ERROR_PREFIXES
+
+# Resolver failures look like "not found" but are often a passing network problem
+TRANSIENT_MESSAGES = {"Could not resolve domain."}
+
+def normalize_key(key):
+    """Normalize a lookup key so equivalent lookups share one request.
+
+    URLs keep the case of their path and query, which many sites treat as
+    case-sensitive; only the scheme and host are lowercased.
+    """
+    if isinstance(key, str):
+        key = key.strip()
+        if key.lower().startswith(("http://", "https://")):
+            parts = urlsplit(key)
+            return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, parts.fragment))
+        return key.rstrip(".").lower()
+    if isinstance(key, (list, tuple)):
+        return tuple(normalize_key(k) for k in key)
+    return key
+
+def is_failure(value):
+    """True for results that should not be kept: errors, skips and resolver failures.
+
+    A failed lookup may be a transient network blip, so only successful
+    results are stored; failures are still shared with concurrent callers.
+    """
+    if isinstance(value, LookupResult):
+        return value.status in (ERROR, SKIPPED)
+    if isinstance(value, str):
+        return value in TRANSIENT_MESSAGES or value.startswith(ERROR_PREFIXES + ("Skipped:",))
+    return value is None
+
+class _Call:
+    """An in-flight synchronous call that other threads can wait on."""
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Share one request and its result between identical lookups within a run.
+
+    Lookups are identified by provider and a normalized key. Concurrent callers
+    wait for the call already in flight, and later callers get the stored result.
+    Failed results are shared with the callers already waiting but not stored.
+    Works for both blocking functions and coroutines. view() gives one run its
+    own call counts over the same shared results.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+        self._calls = {}
+        self._async_calls = {}
+        self.calls_made = 0
+        self.calls_saved = 0
+        self._root = self
+
+    def view(self):
+        """A view for one run: shares calls in flight and stored results but counts its own calls."""
+        run = copy.copy(self)
+        run.calls_made = 0
+        run.calls_saved = 0
+        return run
+
+    def _count(self, counter):
+        setattr(self, counter, getattr(self, counter) + 1)
+        if self._root is not self:
+            setattr(self._root, counter, getattr(self._root, counter) + 1)
+
+    def do(self, provider, key, func, *args, **kwargs):
+        """Run a blocking lookup once per (provider, key) and share its result."""
+        flight_key = (provider, normalize_key(key))
+        with self._lock:
+            if flight_key in self._results:
+                self._count("calls_saved")
+                return self._results[flight_key]
+            call = self._calls.get(flight_key)
+            if call is not None:
+                self._count("calls_saved")
+                leader = False
+            else:
+                call = _Call()
+                self._calls[flight_key] = call
+                self._count("calls_made")
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+        with self._lock:
+            if call.error is None and not is_failure(call.result):
+                self._results[flight_key] = call.result
+            del self._calls[flight_key]
+        call.event.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, provider, key, coro_func, *args, **kwargs):
+        """Await a lookup coroutine once per (provider, key) and share its result."""
+        flight_key = (provider, normalize_key(key))
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if flight_key in self._results:
+                self._count("calls_saved")
+                return self._results[flight_key]
+            pending = self._async_calls.get(flight_key)
+            if pending is not None and pending[0] is loop:
+                self._count("calls_saved")
+                future = pending[1]
+                leader = False
+            else:
+                future = loop.create_future()
+                self._async_calls[flight_key] = (loop, future)
+                self._count("calls_made")
+                leader = True
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await coro_func(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._async_calls.pop(flight_key, None)
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so an unawaited failure does not log a warning.
+                future.exception()
+            raise
+        with self._lock:
+            if not is_failure(result):
+                self._results[flight_key] = result
+            self._async_calls.pop(flight_key, None)
+        future.set_result(result)
+        return result
+
+    def store(self, provider, key, value):
+        """Record a result fetched elsewhere (e.g. by a batch call) for later lookups."""
+        with self._lock:
+            self._results[(provider, normalize_key(key))] = value
+
+    def forget(self, provider, key):
+        """Drop a stored result so the next lookup hits the provider again."""
+        with self._lock:
+            self._results.pop((provider, normalize_key(key)), None)
+
+    def reset(self):
+        """Clear stored results and counters, e.g. at the start of a new run."""
+        with self._lock:
+            self._results.clear()
+            self.calls_made = 0
+            self.calls_saved = 0
+
+    def stats(self):
+        """Return how many provider calls were made and how many were saved."""
+        with self._lock:
+            return {
+                "calls_made": self.calls_made,
+                "calls_saved": self.calls_saved,
+                "cached_results": len(self._results)
+            }
+
+# Example Usage
+if __name__ == "__main__":
+    import socket
+    flight = SingleFlight()
+    for _ in range(3):
+        print(flight.do("dns_a", "Example.com.", socket.gethostbyname, "example.com"))
+    print("Single-flight stats:", flight.stats())
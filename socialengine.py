@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from results import to_result
+
+# Per-platform worker count and pacing (calls allowed per period in seconds)
+PLATFORM_LIMITS = {
+    "twitter": {"workers": 2, "calls": 900, "period": 900},
+    "reddit": {"workers": 4, "calls": 60, "period": 60},
+    "instagram": {"workers": 1, "calls": 20, "period": 60},
+    "linkedin": {"workers": 2, "calls": 30, "period": 60}
+}
+
+TWITTER_BATCH_SIZE = 100
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls evenly so no more than `calls` run per `period`."""
+    def __init__(self, calls, period):
+        self.interval = period / calls
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class SocialLookupEngine:
+    """Run social platform lookups for many usernames concurrently.
+
+    Every platform has its own bounded worker pool and rate limiter, so a slow
+    or throttled platform never holds up the others. Twitter usernames are
+    grouped into users/lookup batches. Results stream back as
+    (username, platform, LookupResult) tuples as soon as each one is ready.
+    """
+    def __init__(self, social_tool, limits=None):
+        self.social_tool = social_tool
+        self.limits = {**PLATFORM_LIMITS, **(limits or {})}
+        self.limiters = {platform: RateLimiter(limit["calls"], limit["period"])
+                         for platform, limit in self.limits.items()}
+
+    def stream(self, usernames, platforms=("twitter", "reddit", "instagram", "linkedin")):
+        """Yield (username, platform, result) for every username on every platform."""
+        usernames = list(dict.fromkeys(usernames))
+        executors = {platform: ThreadPoolExecutor(max_workers=self.limits[platform]["workers"])
+                     for platform in platforms}
+        futures = []
+        try:
+            for platform, executor in executors.items():
+                if platform == "twitter":
+                    for start in range(0, len(usernames), TWITTER_BATCH_SIZE):
+                        batch = usernames[start:start + TWITTER_BATCH_SIZE]
+                        futures.append(executor.submit(self._twitter_batch, batch))
+                else:
+                    futures.extend(executor.submit(self._single, platform, username) for username in usernames)
+
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def lookup_many(self, usernames, platforms=("twitter", "reddit", "instagram", "linkedin")):
+        """Collect stream() into {username: {platform: result}}."""
+        results = {}
+        for username, platform, result in self.stream(usernames, platforms):
+            results.setdefault(username, {})[platform] = result
+        return results
+
+    def _twitter_batch(self, batch):
+        self.limiters["twitter"].wait()
+        start = time.perf_counter()
+        try:
+            results = self.social_tool.search_twitter_users(batch)
+        except Exception as e:
+            results = {username: f"Error: {e}" for username in batch}
+        elapsed = time.perf_counter() - start
+        return [(username, "twitter", to_result("twitter", "user", username,
+                                                results.get(username, "User not found."), elapsed))
+                for username in batch]
+
+    def _single(self, platform, username):
+        self.limiters[platform].wait()
+        search = getattr(self.social_tool, f"search_{platform}_user")
+        try:
+            result = search(username)
+        except Exception as e:
+            result = to_result(platform, "user", username, f"Error: {e}")
+        return [(username, platform, result)]
+
+# Example Usage
+if __name__ == "__main__":
+    from socialmediaupdate import SocialMediaOSINT
+    engine = SocialLookupEngine(SocialMediaOSINT())
+    for username, platform, result in engine.stream(["jack", "spez", "instagram"]):
+        print(username, platform, result)
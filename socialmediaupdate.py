@@ -3,72 +3,107 @@ import json
 import praw
 import tweepy
 import instaloader
-import configparser
-from bs4 import BeautifulSoup
+from credentials import get_credentials
+from profileclassifier import ProfileClassifier
+from results import lookup_result
+from resilience import get_resilience, ProviderSkipped, DEFAULT_TIMEOUT
 
 class SocialMediaOSINT:
-    def __init__(self, config_file="config.ini"):
-        config = configparser.ConfigParser()
-        config.read(config_file)
+    def __init__(self, config_file="config.ini", credentials=None, proxy_pool=None, resilience=None):
+        self.credentials = credentials if credentials else get_credentials(config_file)
+        self.resilience = resilience if resilience else get_resilience()
+        self.proxy_pool = proxy_pool
+        self.classifier = ProfileClassifier()
+        twitter = self.credentials.section("Twitter")
+        reddit = self.credentials.section("Reddit")
 
         self.twitter_api = None
         self.reddit_api = None
-        self.instaloader = instaloader.Instaloader()
+        self.instaloader = instaloader.Instaloader(request_timeout=DEFAULT_TIMEOUT)
 
-        if "Twitter" in config:
+        if twitter:
             try:
-                auth = tweepy.OAuthHandler(config["Twitter"]["api_key"], config["Twitter"]["api_secret"])
-                auth.set_access_token(config["Twitter"]["access_token"], config["Twitter"]["access_secret"])
-                self.twitter_api = tweepy.API(auth)
+                auth = tweepy.OAuthHandler(twitter["api_key"], twitter["api_secret"])
+                auth.set_access_token(twitter["access_token"], twitter["access_secret"])
+                self.twitter_api = tweepy.API(auth, timeout=DEFAULT_TIMEOUT)
             except KeyError as e:
                 print(f"Missing Twitter API key: {e}")
 
-        if "Reddit" in config:
+        if reddit:
             try:
                 self.reddit_api = praw.Reddit(
-                    client_id=config["Reddit"]["client_id"],
-                    client_secret=config["Reddit"]["client_secret"],
-                    user_agent=config["Reddit"]["user_agent"]
+                    client_id=reddit["client_id"],
+                    client_secret=reddit["client_secret"],
+                    user_agent=reddit["user_agent"],
+                    timeout=DEFAULT_TIMEOUT
                 )
             except KeyError as e:
                 print(f"Missing Reddit API key: {e}")
 
+    @lookup_result("twitter", "user")
     def search_twitter_user(self, username):
         """Fetch Twitter user data by username."""
         if not self.twitter_api:
             return "Twitter API not configured."
         try:
-            user = self.twitter_api.get_user(screen_name=username)
-            return {
-                "name": user.name,
-                "username": user.screen_name,
-                "bio": user.description,
-                "followers": user.followers_count,
-                "following": user.friends_count,
-                "tweets": user.statuses_count
-            }
+            user = self.resilience.call("twitter", lambda timeout: self.twitter_api.get_user(screen_name=username))
+            return self._twitter_user_data(user)
+        except ProviderSkipped as e:
+            return str(e)
         except tweepy.TweepyException as e:
             print(f"Error: {e}")
         #print(self.twitter_api)
 
+    def search_twitter_users(self, usernames):
+        """Fetch up to 100 Twitter users in a single users/lookup request."""
+        if not self.twitter_api:
+            return {username: "Twitter API not configured." for username in usernames}
+        try:
+            users = self.resilience.call("twitter", lambda timeout: self.twitter_api.lookup_users(
+                screen_name=list(usernames)))
+        except ProviderSkipped as e:
+            return {username: str(e) for username in usernames}
+        except tweepy.TweepyException as e:
+            return {username: f"Error: {e}" for username in usernames}
+        found = {user.screen_name.lower(): self._twitter_user_data(user) for user in users}
+        return {username: found.get(username.lower(), "User not found.") for username in usernames}
+
+    def _twitter_user_data(self, user):
+        return {
+            "name": user.name,
+            "username": user.screen_name,
+            "bio": user.description,
+            "followers": user.followers_count,
+            "following": user.friends_count,
+            "tweets": user.statuses_count
+        }
+
+    @lookup_result("reddit", "user")
     def search_reddit_user(self, username):
         """Fetch Reddit user data by username."""
         if not self.reddit_api:
             return "Reddit API not configured."
         try:
-            user = self.reddit_api.redditor(username)
-            return {
-                "name": user.name,
-                "karma": user.link_karma + user.comment_karma,
-                "created_utc": user.created_utc
-            }
+            return self.resilience.call("reddit", lambda timeout: self._reddit_user_data(username))
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             print(f"Twitter API Error: {e}")
 
+    def _reddit_user_data(self, username):
+        user = self.reddit_api.redditor(username)
+        return {
+            "name": user.name,
+            "karma": user.link_karma + user.comment_karma,
+            "created_utc": user.created_utc
+        }
+
+    @lookup_result("instagram", "user")
     def search_instagram_user(self, username):
         """Fetch Instagram user data by username."""
         try:
-            profile = instaloader.Profile.from_username(self.instaloader.context, username)
+            profile = self.resilience.call("instagram", lambda timeout: instaloader.Profile.from_username(
+                self.instaloader.context, username))
             return {
                 "name": profile.full_name,
                 "bio": profile.biography,
@@ -76,21 +111,32 @@ class SocialMediaOSINT:
                 "following": profile.followees,
                 "posts": profile.mediacount
             }
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Error: {e}"
 
+    @lookup_result("linkedin", "user")
     def search_linkedin_user(self, username):
         """Fetch LinkedIn user data by username (public profiles only)."""
+        url = f"https://www.linkedin.com/in/{username}/"
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        proxies = self.proxy_pool.requests_proxies(url) if self.proxy_pool else None
+        proxy = proxies["https"] if proxies else None
         try:
-            url = f"https://www.linkedin.com/in/{username}/"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.resilience.call("linkedin", lambda timeout: requests.get(
+                url, headers=headers, proxies=proxies, stream=True, timeout=timeout))
+            if self.proxy_pool:
+                self.proxy_pool.record(proxy, response.status_code not in (407, 429), response.elapsed.total_seconds())
+            if self.classifier.classify(url, response) == "Profile found":
                 return {"profile_url": url, "status": "Profile found (public)"}
             else:
                 return {"profile_url": url, "status": "Profile not accessible"}
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
+            if self.proxy_pool:
+                self.proxy_pool.record(proxy, False)
             return f"Error: {e}"
 
 # Example Usage
@@ -0,0 +1,84 @@
+import asyncio
+from apiserver import CANCELLED, DONE, InvestigationService
+from resilience import Resilience
+from singleflight import SingleFlight
+
+class FakeGeo:
+    def __init__(self, tools, started, cancelled, block):
+        self.tools = tools
+        self.started = started
+        self.cancelled = cancelled
+        self.block = block
+
+    async def get_ip_location(self, ip):
+        return self.tools.flight.do("ipinfo", ip, lambda: {"ip": ip})
+
+    async def get_ip_asn(self, ip):
+        return self.tools.flight.do("ipinfo", ip, lambda: {"ip": ip})
+
+    async def reverse_dns_lookup(self, ip):
+        if not self.block:
+            return "No reverse DNS record found."
+        self.started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+class FakeTools:
+    def __init__(self, block=False):
+        self.flight = SingleFlight()
+        self.resilience = Resilience()
+        self.proxy_pool = None
+        self.block = block
+        self.started = asyncio.Event()
+        self.cancelled = asyncio.Event()
+
+    def for_run(self, deadline=None):
+        run = FakeTools.__new__(FakeTools)
+        run.__dict__.update(self.__dict__)
+        run.flight = self.flight.view()
+        run.resilience = self.resilience.with_deadline(deadline)
+        run.geo = FakeGeo(run, self.started, self.cancelled, self.block)
+        return run
+
+    def close(self):
+        pass
+
+async def _wait_finished(job):
+    while job.finished is None:
+        await asyncio.sleep(0.01)
+
+def test_jobs_report_their_own_single_flight_counts():
+    async def run():
+        tools = FakeTools()
+        service = InvestigationService(tools=tools, workers=2)
+        await service.start()
+        jobs = [service.submit({"ip": "192.0.2.1"}), service.submit({"ip": "192.0.2.2"})]
+        for job in jobs:
+            await asyncio.wait_for(_wait_finished(job), 5)
+        await service.stop()
+        return tools, jobs
+    tools, jobs = asyncio.run(run())
+    for job in jobs:
+        summary = job.summary()
+        assert summary["status"] == DONE
+        assert summary["single_flight"]["calls_made"] == 1
+        assert summary["single_flight"]["calls_saved"] == 1
+    assert tools.flight.stats()["calls_made"] == 2
+
+def test_cancel_stops_running_lookups():
+    async def run():
+        tools = FakeTools(block=True)
+        service = InvestigationService(tools=tools, workers=1)
+        await service.start()
+        job = service.submit({"ip": "192.0.2.1"})
+        await asyncio.wait_for(tools.started.wait(), 5)
+        await service.cancel(job)
+        await asyncio.wait_for(_wait_finished(job), 5)
+        await asyncio.wait_for(tools.cancelled.wait(), 5)
+        await service.stop()
+        return job
+    job = asyncio.run(run())
+    assert job.status == CANCELLED
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from autopivot import AutoPivot, PivotBudget, detect_entity_type
+from results import LookupResult
+
+class FakeDomainTool:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def get_dns_records(self, domain):
+        self.calls.append(domain)
+        if self.delay:
+            time.sleep(self.delay)
+        return LookupResult("dns", "records", domain, payload={"A": ["192.0.2.1"], "MX": ["10 mail.example.com."]})
+
+class FakeEmailTool:
+    hunter_api_key = None
+    hibp_api_key = None
+
+def test_detect_entity_type():
+    assert detect_entity_type("192.0.2.1") == "ip"
+    assert detect_entity_type("john@example.com") == "email"
+    assert detect_entity_type("example.com") == "domain"
+    assert detect_entity_type("johndoe") == "username"
+
+def test_budget_spend_and_remaining():
+    budget = PivotBudget({"dns": 2, "free": None})
+    assert budget.spend("dns") and budget.spend("dns") and not budget.spend("dns")
+    assert budget.remaining("dns") == 0
+    assert budget.remaining("free") is None and budget.spend("free")
+
+def test_unconfigured_tools_spend_no_budget():
+    pivot = AutoPivot(email_tool=FakeEmailTool(), max_depth=3)
+    summary = asyncio.run(pivot.run(["john@example.com", "example.com", "192.0.2.1"]))
+    assert summary["budget_used"] == {}
+    assert summary["skipped"] == []
+    assert summary["entities"]["john"] == {"type": "username", "depth": 1, "score": 0.6}
+
+def test_budget_exhaustion_is_recorded():
+    domain_tool = FakeDomainTool()
+    pivot = AutoPivot(domain_tool=domain_tool, max_depth=1, budget=PivotBudget({"dns": 1}), concurrency=1)
+    summary = asyncio.run(pivot.run(["a.example", "b.example"]))
+    assert len(domain_tool.calls) == 1
+    assert summary["budget_used"] == {"dns": 1}
+    assert summary["skipped"] == [{"entity": "b.example", "provider": "dns", "reason": "budget exhausted"}]
+
+def test_depth_limit_stops_expansion():
+    domain_tool = FakeDomainTool()
+    pivot = AutoPivot(domain_tool=domain_tool, max_depth=1)
+    summary = asyncio.run(pivot.run(["example.com"]))
+    assert domain_tool.calls == ["example.com"]
+    assert summary["entities"]["192.0.2.1"]["depth"] == 1
+    assert summary["entities"]["mail.example.com"] == {"type": "host", "depth": 1, "score": 0.5}
+
+def test_deadline_stops_cleanly():
+    domain_tool = FakeDomainTool(delay=0.3)
+    pivot = AutoPivot(domain_tool=domain_tool, max_depth=3, deadline=0.1, concurrency=2)
+    summary = asyncio.run(pivot.run(["a.example", "b.example", "c.example"]))
+    reasons = {(entry["entity"], entry["reason"]) for entry in summary["skipped"]}
+    assert ("a.example", "run deadline reached") in reasons
+    assert ("c.example", "run deadline reached") in reasons
+    assert set(summary["entities"]) == {"a.example", "b.example", "c.example"}
+    assert summary["failed"] == []
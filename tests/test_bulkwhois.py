@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import time
+import pytest
+from bulkwhois import BulkWhois, registered_domain, whois_server_for
+
+@pytest.fixture
+def bulk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return BulkWhois(per_server_concurrency=1, min_interval=0.05)
+
+def test_registered_domain():
+    assert registered_domain("mail.Example.com.") == "example.com"
+    assert registered_domain("www.example.co.uk") == "example.co.uk"
+    assert whois_server_for("example.net") == "whois.verisign-grs.com"
+    assert whois_server_for("example.fr") == "whois.nic.fr"
+
+def test_slot_releases_the_semaphore_it_acquired(bulk):
+    async def run():
+        semaphores = {}
+        slot = bulk._polite(semaphores, "whois.example")
+        async with slot:
+            semaphores.clear()
+        assert slot.semaphore._value == 1
+    asyncio.run(run())
+
+def test_pacing_is_shared_across_threads(bulk):
+    starts = []
+
+    def worker():
+        async def run():
+            async with bulk._polite({}, "whois.example"):
+                starts.append(time.monotonic())
+        asyncio.run(run())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    starts.sort()
+    assert all(later - earlier >= 0.04 for earlier, later in zip(starts, starts[1:]))
@@ -0,0 +1,67 @@
+import os
+import time
+import pytest
+from credentials import FORBIDDEN_COOLDOWN, CredentialProvider
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "config.ini"
+    path.write_text("[API_KEYS]\nhibp_api_key = first, second\nhibp_api_key_2 = third\n")
+    return path
+
+def _touch(path, text):
+    path.write_text(text)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+def test_keys_are_loaded_and_ordered_by_remaining_quota(config):
+    credentials = CredentialProvider(str(config))
+    assert [key.value for key in credentials.pools["hibp"]] == ["first", "second", "third"]
+    credentials.report_response("hibp", "first", 200, {"X-RateLimit-Remaining": "5"})
+    credentials.report_response("hibp", "second", 200, {"X-RateLimit-Remaining": "50"})
+    credentials.report_response("hibp", "third", 200, {"X-RateLimit-Remaining": "20"})
+    assert [credentials.acquire("hibp") for _ in range(3)] == ["second", "second", "second"]
+    assert credentials.pools["hibp"][1].remaining == 47
+
+def test_unknown_quota_rotates_least_recently_used(config):
+    credentials = CredentialProvider(str(config))
+    assert [credentials.acquire("hibp") for _ in range(4)] == ["first", "second", "third", "first"]
+
+def test_rate_limited_key_cools_off(config):
+    credentials = CredentialProvider(str(config))
+    assert credentials.report_response("hibp", "first", 429, {"Retry-After": "30"})
+    entry = credentials.pools["hibp"][0]
+    assert 29 < entry.exhausted_until - time.monotonic() <= 30
+    assert "first" not in {credentials.acquire("hibp") for _ in range(4)}
+    entry.exhausted_until = time.monotonic() - 1
+    assert credentials.acquire("hibp") == "first"
+
+def test_call_retries_on_next_key(config):
+    credentials = CredentialProvider(str(config))
+    statuses = iter([429, 200])
+    used = []
+    response = credentials.call("hibp", lambda key: used.append(key) or FakeResponse(next(statuses)))
+    assert response.status_code == 200 and used == ["first", "second"]
+
+def test_forbidden_is_a_cooldown_not_a_revocation(config):
+    credentials = CredentialProvider(str(config))
+    assert credentials.report_response("hibp", "first", 403)
+    entry = credentials.pools["hibp"][0]
+    assert not entry.revoked
+    assert FORBIDDEN_COOLDOWN - 1 < entry.exhausted_until - time.monotonic() <= FORBIDDEN_COOLDOWN
+    assert credentials.report_error("hibp", "second", "Access denied (403 Forbidden)")
+    assert not credentials.pools["hibp"][1].revoked
+
+def test_reload_picks_up_keys_and_forgives_revocation(config):
+    credentials = CredentialProvider(str(config), reload_interval=0)
+    credentials.report_response("hibp", "first", 401)
+    assert credentials.status()["hibp"]["revoked"] == 1
+    _touch(config, "[API_KEYS]\nhibp_api_key = first, fourth\n")
+    assert credentials.has("hibp")
+    assert [key.value for key in credentials.pools["hibp"]] == ["first", "fourth"]
+    assert credentials.status()["hibp"] == {"keys": 2, "available": 2, "revoked": 0, "uses": 0}
@@ -0,0 +1,103 @@
+import time
+import pytest
+from credentials import CredentialProvider
+from distributed import DONE, FAILED, LEASED, QUEUED, GlobalRateLimiter, QueueWorker, WorkQueue
+from results import LookupResult
+
+@pytest.fixture
+def queue(tmp_path):
+    return WorkQueue(str(tmp_path / "queue.db"), max_attempts=2)
+
+def _task_state(queue, task_id):
+    return queue._connection().execute(
+        "SELECT status, lease_owner, attempts FROM tasks WHERE id = ?", (task_id,)).fetchone()
+
+def test_lease_is_exclusive_until_it_expires(queue):
+    queue.enqueue("job", [("whois", "example.com"), ("whois", "example.com")])
+    (task,) = queue.lease("worker-a", limit=10, visibility_timeout=0.05)
+    assert queue.lease("worker-b", limit=10) == []
+    time.sleep(0.1)
+    (again,) = queue.lease("worker-b", limit=10, visibility_timeout=60)
+    assert again[0] == task[0]
+    assert _task_state(queue, task[0]) == (LEASED, "worker-b", 2)
+
+def test_only_the_lease_holder_can_complete(queue):
+    queue.enqueue("job", [("whois", "example.com")])
+    (task,) = queue.lease("worker-a", visibility_timeout=0.05)
+    time.sleep(0.1)
+    queue.lease("worker-b", visibility_timeout=60)
+    result = LookupResult("whois", "whois", "example.com", payload={"registrar": "X"})
+    assert not queue.complete("worker-a", task[0], result)
+    assert queue.complete("worker-b", task[0], result)
+    assert list(queue.results("job")) == [result]
+    assert queue.progress("job")[DONE] == 1
+
+def test_heartbeat_extends_held_leases_and_reports_lost_ones(queue):
+    queue.enqueue("job", [("whois", "a.com"), ("whois", "b.com")])
+    first, second = queue.lease("worker-a", visibility_timeout=0.2)
+    time.sleep(0.1)
+    assert queue.heartbeat("worker-a", [first[0]], visibility_timeout=60) == []
+    time.sleep(0.15)
+    (stolen,) = queue.lease("worker-b", visibility_timeout=60)
+    assert stolen[0] == second[0]
+    assert queue.heartbeat("worker-a", [first[0], second[0]], visibility_timeout=60) == [second[0]]
+
+def test_task_fails_after_max_attempts(queue):
+    queue.enqueue("job", [("whois", "example.com")])
+    for _ in range(2):
+        (task,) = queue.lease("worker", visibility_timeout=60)
+        queue.release("worker", task[0])
+        assert _task_state(queue, task[0])[0] == QUEUED
+    assert queue.lease("worker") == []
+    assert queue.progress("job")[FAILED] == 1
+    (result,) = queue.results("job")
+    assert result.status == "error"
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+def test_rate_limit_is_charged_per_request(queue, tmp_path):
+    config = tmp_path / "config.ini"
+    config.write_text("[API_KEYS]\nhibp_api_key = first, second\n")
+    credentials = CredentialProvider(str(config))
+    limiter = GlobalRateLimiter(queue, limits={"hibp": 1000})
+    charged = []
+    credentials.throttle = lambda provider: (charged.append(provider), limiter.wait(provider))
+
+    statuses = iter([401, 200])
+    response = credentials.call("hibp", lambda key: FakeResponse(next(statuses)))
+    assert response.status_code == 200
+    assert charged == ["hibp", "hibp"]
+    next_slot = queue._connection().execute("SELECT next_slot FROM rate_limits WHERE provider = 'hibp'").fetchone()
+    assert next_slot[0] > time.time()
+
+def test_worker_installs_and_restores_throttle(queue, tmp_path):
+    class Tools:
+        credentials = CredentialProvider(str(tmp_path / "missing.ini"))
+    worker = QueueWorker(queue, tools=Tools(), heartbeat_interval=60)
+    seen = []
+    worker.run_operation = lambda operation, target: seen.append(Tools.credentials.throttle) or \
+        LookupResult("whois", operation, target)
+    queue.enqueue("job", [("whois", "example.com")])
+    assert worker.run(stop_when_idle=True, idle_sleep=0.01) == 1
+    assert seen == [worker.rate_limiter.wait]
+    assert Tools.credentials.throttle is None
+
+def test_worker_runs_tools_without_hedging(queue, tmp_path):
+    class Tools:
+        credentials = CredentialProvider(str(tmp_path / "missing.ini"))
+        def __init__(self, hedge=None):
+            self.hedge = hedge
+        def for_run(self, deadline=None, hedge=None):
+            return Tools(hedge)
+    shared = Tools()
+    worker = QueueWorker(queue, tools=shared, heartbeat_interval=60)
+    seen = []
+    worker.run_operation = lambda operation, target: seen.append(worker.tools.hedge) or \
+        LookupResult("whois", operation, target)
+    queue.enqueue("job", [("whois", "example.com")])
+    assert worker.run(stop_when_idle=True, idle_sleep=0.01) == 1
+    assert seen == [False]
+    assert worker.tools is shared
@@ -0,0 +1,38 @@
+import dns.resolver
+import pytest
+from domainlookupupdate import DomainLookup
+from resilience import Resilience
+
+class FakeAnswer:
+    def __init__(self, text):
+        self.text = text
+
+    def to_text(self):
+        return self.text
+
+@pytest.fixture
+def lookup(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return DomainLookup(resilience=Resilience(timeout=5).with_deadline(2))
+
+def test_dns_lifetime_follows_deadline(lookup, monkeypatch):
+    lifetimes = []
+
+    def resolve(domain, record_type, lifetime=None):
+        lifetimes.append(lifetime)
+        if record_type != "A":
+            raise dns.resolver.NoAnswer()
+        return [FakeAnswer("93.184.216.34")]
+    monkeypatch.setattr(dns.resolver, "resolve", resolve)
+    records = lookup.get_dns_records("example.com").payload
+    assert records["A"] == ["93.184.216.34"]
+    assert records["MX"] == "No record found."
+    assert all(0 < lifetime <= 2 for lifetime in lifetimes)
+    assert lookup.resilience.stats["failures"] == 0
+
+def test_missing_domain_is_not_a_provider_failure(lookup, monkeypatch):
+    def resolve(domain, record_type, lifetime=None):
+        raise dns.resolver.NXDOMAIN()
+    monkeypatch.setattr(dns.resolver, "resolve", resolve)
+    assert lookup.get_dns_records("nope.invalid").error == "Domain does not exist."
+    assert lookup.resilience.breaker("dns").failures == 0
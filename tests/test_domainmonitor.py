@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+import dns.exception
+import dns.resolver
+import pytest
+import dns.name
+from domainmonitor import DAY, EXPIRY_GRACE, DomainMonitor, diff_snapshots, valid_domain
+
+class FakeRRset:
+    ttl = 600
+
+class FakeRdata:
+    def __init__(self, text):
+        self.text = text
+
+    def to_text(self):
+        return self.text
+
+class FakeAnswer(list):
+    rrset = FakeRRset()
+
+class FakeResolver:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def resolve(self, domain, record_type):
+        if self.error:
+            raise self.error
+        if record_type == "A":
+            return FakeAnswer([FakeRdata("192.0.2.1")])
+        raise dns.resolver.NoAnswer()
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return DomainMonitor(record_types=("A", "MX"), min_interval=300, whois_interval=7 * DAY,
+                         cache_dir=str(tmp_path))
+
+def test_diff_snapshots_lists():
+    old = {"status": ["ok", "clientTransferProhibited"], "registrar": "A"}
+    new = {"status": ["clientTransferProhibited", "ok"], "registrar": "B"}
+    assert diff_snapshots(old, new, ("status", "registrar")) == {"registrar": {"old": "A", "new": "B"}}
+    changes = diff_snapshots({"NS": ["a.ns"]}, {"NS": ["b.ns", "a.ns"]}, ("NS",))
+    assert changes["NS"]["added"] == ["b.ns"] and changes["NS"]["removed"] == []
+
+def test_next_whois_check_schedule(monitor):
+    now = 1_000_000_000.0
+    def check(expires_in):
+        return monitor._next_whois_check({"expiration_date": _iso(now + expires_in)}, now) - now
+    assert monitor._next_whois_check({}, now) - now == 7 * DAY
+    assert check(30 * DAY) == 7 * DAY
+    assert check(5 * DAY) == DAY
+    assert check(3600) == 3600
+    assert check(60) == 300
+    assert check(-10 * DAY) == DAY
+    assert check(-EXPIRY_GRACE - DAY) == 7 * DAY
+
+def test_timeout_keeps_snapshot_and_retries_soon(monitor):
+    monitor.resolver = FakeResolver()
+    assert asyncio.run(monitor._refresh_dns("example.com")) == []
+    stored = monitor.snapshots.get("dns:example.com")
+    assert stored["snapshot"]["A"] == ["192.0.2.1"]
+
+    monitor.resolver = FakeResolver(dns.exception.Timeout())
+    before = time.time()
+    assert asyncio.run(monitor._refresh_dns("example.com")) == []
+    retried = monitor.snapshots.get("dns:example.com")
+    assert retried["snapshot"] == stored["snapshot"]
+    assert before + 300 <= retried["next_due"] < before + 310
+
+def test_nxdomain_is_a_change(monitor):
+    monitor.resolver = FakeResolver()
+    asyncio.run(monitor._refresh_dns("example.com"))
+    monitor.resolver = FakeResolver(dns.resolver.NXDOMAIN())
+    events = asyncio.run(monitor._refresh_dns("example.com"))
+    assert {event["field"] for event in events} == {"exists", "A", "MX"}
+
+def test_malformed_names_are_rejected(monitor):
+    assert not valid_domain("foo..com")
+    assert not valid_domain("a" * 70 + ".com")
+    assert not valid_domain("localhost")
+    assert monitor.add("foo..com") is False
+    assert monitor.add("Example.com.") is True
+    assert monitor.domains == {"example.com"}
+
+def test_other_resolver_errors_are_unknown(monitor):
+    monitor.resolver = FakeResolver(dns.name.EmptyLabel())
+    assert asyncio.run(monitor._refresh_dns("example.com")) == []
+    assert len(monitor._heap) == 1
+
+def test_failed_refresh_does_not_stop_watch(monitor):
+    monitor.add("example.com")
+    monitor.add("example.org")
+    async def broken(domain):
+        if domain == "example.com":
+            raise RuntimeError("boom")
+        return [{"domain": domain}]
+    async def no_whois(domains):
+        return []
+    monitor._refresh_dns = broken
+    monitor._refresh_whois = no_whois
+    async def first_event():
+        async for event in monitor.watch():
+            return event
+    assert asyncio.run(first_event()) == {"domain": "example.org"}
+    assert monitor.stats["errors"] == 1
+    assert any(entry[2] == "example.com" and entry[3] == "dns" and entry[0] > time.time() for entry in monitor._heap)
+
+def test_remove_then_add_keeps_one_schedule(monitor):
+    monitor.add("example.com")
+    monitor.remove("example.com")
+    monitor.add("example.com")
+    live = [entry for entry in monitor._heap if monitor._is_current(entry[1], entry[2], entry[3])]
+    assert sorted(entry[3] for entry in live) == ["dns", "whois"]
@@ -0,0 +1,86 @@
+import asyncio
+import dns.exception
+import dns.name
+import dns.resolver
+import pytest
+from emailprefilter import EmailPrefilter, normalize_email
+
+class FakeExchange:
+    def __init__(self, name):
+        self.name = name
+
+    def to_text(self):
+        return self.name
+
+class FakeMX:
+    def __init__(self, preference, exchange):
+        self.preference = preference
+        self.exchange = FakeExchange(exchange)
+
+class FakeResolver:
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+
+    async def resolve(self, domain, record_type):
+        self.queries.append((domain, record_type))
+        answer = self.answers.get((domain, record_type), dns.resolver.NoAnswer())
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+@pytest.fixture
+def prefilter(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return EmailPrefilter()
+
+def test_normalize_email():
+    assert normalize_email(" John.Doe+news@GoogleMail.com ") == ("johndoe@gmail.com", "gmail.com")
+    assert normalize_email("jane-work@yahoo.com") == ("jane@yahoo.com", "yahoo.com")
+    assert normalize_email("first.last+tag@example.com") == ("first.last+tag@example.com", "example.com")
+    assert normalize_email("broken@") is None
+    assert normalize_email("+news@gmail.com") is None
+
+def test_group_dedupes_and_rejects(prefilter):
+    by_domain, rejected = prefilter.group(["a.b@gmail.com", "ab+x@gmail.com", "x@mailinator.com", "nope"])
+    assert by_domain == {"gmail.com": ["ab@gmail.com"]}
+    assert rejected == {"x@mailinator.com": "disposable domain", "nope": "malformed"}
+
+def test_mx_answers(prefilter):
+    prefilter.resolver = FakeResolver({
+        ("mx.test", "MX"): [FakeMX(20, "b.mx.test."), FakeMX(10, "a.mx.test.")],
+        ("nullmx.test", "MX"): [FakeMX(0, ".")],
+        ("gone.test", "MX"): dns.resolver.NXDOMAIN(),
+        ("plain.test", "AAAA"): ["2001:db8::1"],
+    })
+    run = lambda domain: asyncio.run(prefilter._resolve_mx(domain))
+    assert run("mx.test") == ["a.mx.test", "b.mx.test"]
+    assert run("nullmx.test") == []
+    assert run("gone.test") == "domain does not exist"
+    assert run("plain.test") == ["plain.test"]
+    assert run("nothing.test") == []
+
+@pytest.mark.parametrize("error", [dns.exception.Timeout(), dns.resolver.NoNameservers()])
+def test_fallback_failure_is_unknown_and_uncached(prefilter, error):
+    prefilter.resolver = FakeResolver({("slow.test", "A"): error})
+    assert asyncio.run(prefilter.mail_hosts("slow.test")) is None
+    assert prefilter.cache.get("slow.test") is None
+    result = asyncio.run(prefilter.filter(["user@slow.test"]))
+    assert result["deliverable"] == {"slow.test": ["user@slow.test"]}
+
+def test_overlong_labels_are_malformed(prefilter):
+    long_label = "x@" + "a" * 70 + ".com"
+    assert normalize_email(long_label) is None
+    assert normalize_email("x@" + ".".join(["a" * 60] * 5)) is None
+    by_domain, rejected = prefilter.group(["ok@example.com", long_label])
+    assert by_domain == {"example.com": ["ok@example.com"]}
+    assert rejected == {long_label: "malformed"}
+
+def test_other_dns_errors_are_unknown(prefilter):
+    prefilter.resolver = FakeResolver({
+        ("odd.test", "MX"): dns.name.LabelTooLong(),
+        ("ok.test", "MX"): [FakeMX(10, "mx.ok.test.")],
+    })
+    result = asyncio.run(prefilter.filter(["a@odd.test", "b@ok.test"]))
+    assert result["deliverable"] == {"odd.test": ["a@odd.test"], "ok.test": ["b@ok.test"]}
+    assert prefilter.cache.get("odd.test") is None
@@ -0,0 +1,69 @@
+from entityresolution import EntityResolver, MinHashLSH, identity_token, jaccard, normalize_identity, shingles
+
+def test_normalize_identity():
+    assert normalize_identity("John.Doe+news@gmail.com") == "johndoe"
+    assert normalize_identity("john_doe123") == "johndoe"
+    assert normalize_identity("@johndoe") == "johndoe"
+    assert normalize_identity("www.johndoe.co.uk") == "johndoe"
+    assert normalize_identity("john.doe@example.com") == "johndoe"
+
+def test_normalize_identity_rejects_noise():
+    assert normalize_identity(None) is None
+    assert normalize_identity("ab") is None
+    assert normalize_identity("12345") is None
+    assert normalize_identity("https://example.com/user") is None
+    assert normalize_identity("two words") is None
+
+def test_lsh_band_keys_are_deterministic():
+    grams = shingles("johndoe")
+    assert MinHashLSH().band_keys(grams) == MinHashLSH().band_keys(grams)
+    assert len(MinHashLSH(num_perm=64, bands=16).band_keys(grams)) == 16
+
+def test_links_near_duplicates():
+    resolver = EntityResolver()
+    assert resolver.add("john.doe@gmail.com") == []
+    assert resolver.add("john_doe123") == [("john.doe@gmail.com", 1.0)]
+    links = dict(resolver.add("johndoes"))
+    assert links["john.doe@gmail.com"] >= resolver.threshold
+
+def test_threshold_filters_weak_candidates():
+    strict = EntityResolver(threshold=0.95)
+    strict.add("johndoe")
+    assert strict.add("johndoes") == []
+    assert jaccard(shingles("johndoe"), shingles("johndoes")) < 0.95
+
+def test_same_type_attribute_does_not_link():
+    resolver = EntityResolver()
+    resolver.add("alice_wonder", {"type": "username", "source": "crawler", "status": "active"})
+    assert resolver.add("zebra_crossing", {"type": "username", "source": "crawler", "status": "active"}) == []
+
+def test_identity_attributes_link():
+    resolver = EntityResolver()
+    resolver.add("jdoe_1984")
+    links = resolver.add("198.51.100.7", {"username": "jdoe_1984", "type": "ip"})
+    assert links == [("jdoe_1984", 1.0)]
+
+def test_role_accounts_are_not_identities():
+    assert normalize_identity("info@example.org") is None
+    assert normalize_identity("Support+tickets@example.com") is None
+    resolver = EntityResolver()
+    resolver.add("info@example.org")
+    assert resolver.add("info@foo.com") == []
+    resolver.add("admin@gmail.com")
+    assert resolver.add("admin@example.com") == []
+
+def test_cross_domain_first_names_score_lower():
+    resolver = EntityResolver()
+    resolver.add("john@example.com")
+    assert resolver.add("john@foo.com") == []
+    assert resolver.add("john@example.com") == []
+    assert resolver.add("john") == [("john@example.com", 1.0), ("john@foo.com", 1.0)]
+
+def test_distinctive_local_parts_link_across_domains():
+    assert identity_token("john.doe@example.com") == ("johndoe", "example.com", True)
+    assert identity_token("john@example.com") == ("john", "example.com", False)
+    resolver = EntityResolver()
+    resolver.add("john.doe@example.com")
+    assert resolver.add("johndoe@foo.com") == [("john.doe@example.com", 1.0)]
+    resolver.add("christopherson@example.com")
+    assert resolver.add("christopherson@foo.com") == [("christopherson@example.com", 1.0)]
@@ -0,0 +1,60 @@
+import pytest
+from profileclassifier import ProfileClassifier, _Matcher, site_for, FOUND, NOT_FOUND
+from singleflight import is_failure
+
+SIGNATURES = {"negative": ["page not found"], "positive": ['"@type":"person"']}
+
+class FakeResponse:
+    def __init__(self, status_code, chunks):
+        self.status_code = status_code
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        yield from self.chunks
+
+    def close(self):
+        self.closed = True
+
+def test_site_for_strips_www():
+    assert site_for("https://WWW.GitHub.com/jack") == "github.com"
+
+def test_signature_split_across_chunks():
+    matcher = _Matcher(SIGNATURES)
+    assert matcher.feed(b"<html>... Page No") is None
+    assert matcher.feed(b"t Found ...") == NOT_FOUND
+
+def test_tail_is_bounded_by_longest_signature():
+    matcher = _Matcher(SIGNATURES)
+    matcher.feed(b"x" * 10000)
+    assert len(matcher.tail) == len('"@type":"person"') - 1
+
+def test_negative_wins_over_positive_in_same_window():
+    matcher = _Matcher(SIGNATURES)
+    assert matcher.feed(b'{"@type":"Person"} page not found') == NOT_FOUND
+
+def test_positive_match():
+    assert _Matcher(SIGNATURES).feed(b'{"@TYPE":"PERSON"}') == FOUND
+
+def test_classify_stops_early_and_closes():
+    classifier = ProfileClassifier(signatures={"medium.com": SIGNATURES})
+    chunks = [b"<head>", b'{"@type":"person"}', b"never read"]
+    response = FakeResponse(200, iter(chunks))
+    assert classifier.classify("https://medium.com/@someone", response) == FOUND
+    assert response.closed
+    assert classifier.early_stops == 1
+    assert next(response.chunks) == b"never read"
+
+def test_classify_falls_back_to_status():
+    classifier = ProfileClassifier(signatures={"medium.com": SIGNATURES}, max_bytes=10)
+    assert classifier.classify("https://medium.com/@a", FakeResponse(404, [])) == NOT_FOUND
+    assert classifier.classify("https://medium.com/@a", FakeResponse(200, [b"x" * 20, b"page not found"])) == FOUND
+    assert classifier.classify("https://example.org/a", FakeResponse(200, [b"page not found"])) == FOUND
+
+@pytest.mark.parametrize("status", [401, 403, 429, 500, 503])
+def test_blocked_or_failed_status_is_an_error(status):
+    classifier = ProfileClassifier(signatures={"medium.com": SIGNATURES})
+    response = FakeResponse(status, [])
+    verdict = classifier.classify("https://medium.com/@a", response)
+    assert verdict == f"Error: HTTP {status}"
+    assert is_failure(verdict) and response.closed
@@ -0,0 +1,21 @@
+from proxypool import ProxyPool
+
+def test_close_stops_health_thread(monkeypatch):
+    pool = ProxyPool(["http://proxy-one:8080"], check_interval=60)
+    monkeypatch.setattr(pool, "check_all", lambda: {})
+    pool.start()
+    thread = pool._thread
+    pool.close(timeout=5)
+    assert not thread.is_alive()
+    assert pool._thread is None
+    pool.close()
+
+def test_failures_drop_proxy_from_rotation():
+    pool = ProxyPool(["http://proxy-one:8080"], max_failures=2)
+    proxy = pool.choose("https://www.linkedin.com/in/someone/")
+    assert proxy == "http://proxy-one:8080"
+    pool.record(proxy, False)
+    pool.record(proxy, False)
+    assert pool.choose("https://www.linkedin.com/in/someone/") is None
+    pool.record(proxy, True, 0.2)
+    assert pool.choose("https://www.linkedin.com/in/someone/") == proxy
@@ -0,0 +1,96 @@
+import threading
+import time
+import pytest
+from resilience import CircuitBreaker, Deadline, LatencyTracker, ProviderSkipped, Resilience
+
+class FakeResponse:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def test_deadline():
+    assert Deadline().remaining() is None
+    assert Deadline().timeout(15) == 15
+    deadline = Deadline(0.5)
+    assert 0 < deadline.timeout(15) <= 0.5
+    assert Deadline(0).expired
+
+def test_circuit_breaker_opens_and_recovers(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record(False)
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    now[0] += 30
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    now[0] += 30
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+def test_latency_percentile_needs_samples():
+    tracker = LatencyTracker(min_samples=5)
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        tracker.add(seconds)
+    assert tracker.percentile(0.95) is None
+    tracker.add(0.5)
+    assert tracker.percentile(0.95) == 0.5
+
+def test_open_circuit_skips_calls():
+    resilience = Resilience(failure_threshold=1)
+    assert resilience.call("api", lambda timeout: FakeResponse(503)).status_code == 503
+    with pytest.raises(ProviderSkipped):
+        resilience.call("api", lambda timeout: FakeResponse())
+    assert resilience.skipped == [{"provider": "api", "reason": "circuit open for api"}]
+
+def test_with_deadline_views_share_state_but_not_stats():
+    parent = Resilience(failure_threshold=1)
+    run = parent.with_deadline(60)
+    run.call("api", lambda timeout: FakeResponse(500))
+    assert parent.breaker("api").state == CircuitBreaker.OPEN
+    assert run.stats == {"calls": 1, "hedged": 0, "failures": 1}
+    assert parent.stats == {"calls": 1, "hedged": 0, "failures": 1}
+    other = parent.with_deadline(60)
+    assert other.stats["calls"] == 0 and other.skipped == []
+    assert run._hedge_executor() is other._hedge_executor() is parent._executor
+    parent.close()
+
+def test_hedged_call_closes_losing_response():
+    resilience = Resilience(min_samples=1)
+    resilience.tracker("api").add(0.01)
+    release = threading.Event()
+    responses = []
+
+    def send(timeout):
+        response = FakeResponse()
+        responses.append(response)
+        if len(responses) == 1:
+            release.wait(2)
+        return response
+
+    winner = resilience.call("api", send)
+    assert winner is responses[1] and resilience.stats["hedged"] == 1
+    release.set()
+    resilience._executor.shutdown(wait=True)
+    assert responses[0].closed and not winner.closed
+
+def test_view_without_hedging_sends_once():
+    parent = Resilience(min_samples=1)
+    parent.tracker("api").add(0.001)
+    run = parent.with_deadline(60, hedge=False)
+    sent = []
+    def send(timeout):
+        sent.append(timeout)
+        time.sleep(0.05)
+        return FakeResponse()
+    run.call("api", send)
+    assert len(sent) == 1 and run.stats["hedged"] == 0
+    assert parent.hedge and run.with_deadline(10).hedge is False
@@ -0,0 +1,70 @@
+import pytest
+import shodan
+from shodanenrich import NO_INFO, ShodanEnrichment
+
+class FakeShodan:
+    def __init__(self):
+        self.calls = []
+
+    def search(self, query, page=1, minify=False):
+        self.calls.append(("search", query))
+        return {"total": 2, "matches": [{"ip_str": "10.0.0.1", "port": 80}, {"ip_str": "10.0.0.2", "port": 443}]}
+
+    def host(self, ips, minify=False):
+        self.calls.append(("host", ips))
+        ips = ips if isinstance(ips, list) else [ips]
+        return [{"ip_str": ip, "ports": [22]} for ip in ips]
+
+@pytest.fixture
+def enrichment(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    resolve = {"a.test": "10.0.0.1", "b.test": "10.0.0.2", "c.test": "192.0.2.9"}.get
+    return ShodanEnrichment(FakeShodan(), resolve=resolve, requests_per_second=1000, netblock_threshold=2)
+
+def test_netblock_records_are_cached_separately(enrichment):
+    results = enrichment.enrich(["a.test", "b.test", "c.test"])
+    assert results["a.test"]["shodan"]["source"] == "net_search"
+    assert "source" not in results["c.test"]["shodan"]
+    assert enrichment.cache.get("10.0.0.1") is None
+    assert enrichment.netblock_cache.get("10.0.0.1")["ports"] == [80]
+    assert enrichment.cache.get("192.0.2.9")["ports"] == [22]
+
+def test_cached_hosts_are_not_fetched_again(enrichment):
+    enrichment.enrich(["a.test", "b.test", "c.test"])
+    calls = len(enrichment.shodan_api.calls)
+    enrichment.enrich(["a.test", "c.test"])
+    assert len(enrichment.shodan_api.calls) == calls
+
+class PartialShodan(FakeShodan):
+    """Fails any multi-IP lookup that includes an unknown IP, like the real API."""
+    def __init__(self, unknown):
+        super().__init__()
+        self.unknown = set(unknown)
+
+    def host(self, ips, minify=False):
+        self.calls.append(("host", ips))
+        ips = ips if isinstance(ips, list) else [ips]
+        if self.unknown & set(ips):
+            raise shodan.APIError(NO_INFO)
+        return [{"ip_str": ip, "ports": [22]} for ip in ips]
+
+def test_failed_batch_is_split_in_halves(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ips = [f"192.0.2.{i}" for i in range(1, 65)]
+    api = PartialShodan(unknown={"192.0.2.17"})
+    enrichment = ShodanEnrichment(api, resolve=lambda domain: domain, requests_per_second=1000,
+                                  netblock_threshold=1000)
+    results = enrichment.enrich(ips)
+    assert results["192.0.2.17"]["shodan"] == NO_INFO
+    assert results["192.0.2.18"]["shodan"]["ports"] == [22]
+    assert len(api.calls) <= 2 * 7 + 1
+
+def test_unknown_ips_are_cached_negatively(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    api = PartialShodan(unknown={"192.0.2.1"})
+    enrichment = ShodanEnrichment(api, resolve=lambda domain: domain, requests_per_second=1000)
+    enrichment.enrich(["192.0.2.1", "192.0.2.2"])
+    calls = len(api.calls)
+    assert enrichment.enrich(["192.0.2.1"])["192.0.2.1"]["shodan"] == NO_INFO
+    assert len(api.calls) == calls
+    assert enrichment.missing_cache.max_age < enrichment.cache.max_age
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+from singleflight import SingleFlight, normalize_key
+
+def test_normalize_key_lowercases_hosts_but_not_url_paths():
+    assert normalize_key(" Example.COM. ") == "example.com"
+    assert normalize_key("HTTPS://GitHub.com/JohnDoe") == "https://github.com/JohnDoe"
+    assert normalize_key("https://github.com/johndoe") != normalize_key("https://github.com/JohnDoe")
+    assert normalize_key(["A.com", "B.com"]) == ("a.com", "b.com")
+
+def test_repeated_lookups_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    lookup = lambda domain: calls.append(domain) or "93.184.216.34"
+    assert flight.do("dns_a", "example.com", lookup, "example.com") == "93.184.216.34"
+    assert flight.do("dns_a", "EXAMPLE.com.", lookup, "example.com") == "93.184.216.34"
+    assert calls == ["example.com"]
+    assert flight.stats() == {"calls_made": 1, "calls_saved": 1, "cached_results": 1}
+
+def test_concurrent_callers_wait_for_the_call_in_flight():
+    flight = SingleFlight()
+    calls = []
+
+    def slow(key):
+        calls.append(key)
+        time.sleep(0.1)
+        return {"key": key}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("p", "k", slow, "k"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"key": "k"}] * 5
+
+def test_failures_are_not_stored():
+    flight = SingleFlight()
+    answers = iter(["Could not resolve domain.", "Error: timed out", "93.184.216.34"])
+    lookup = lambda: next(answers)
+    assert flight.do("dns_a", "example.com", lookup) == "Could not resolve domain."
+    assert flight.do("dns_a", "example.com", lookup) == "Error: timed out"
+    assert flight.do("dns_a", "example.com", lookup) == "93.184.216.34"
+    assert flight.do("dns_a", "example.com", lookup) == "93.184.216.34"
+
+def test_exceptions_propagate_and_are_not_stored():
+    flight = SingleFlight()
+
+    def broken():
+        raise OSError("down")
+
+    for _ in range(2):
+        try:
+            flight.do("p", "k", broken)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("expected OSError")
+    assert flight.stats()["calls_made"] == 2
+
+def test_async_callers_share_one_coroutine():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return "Profile found"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("profile", "https://x.com/a", fetch, "https://x.com/a")
+                                      for _ in range(4)))
+
+    assert asyncio.run(main()) == ["Profile found"] * 4
+    assert calls == ["https://x.com/a"]
+
+def test_view_counts_its_own_calls():
+    flight = SingleFlight()
+    first, second = flight.view(), flight.view()
+    assert first.do("dns_a", "example.com", lambda: "192.0.2.1") == "192.0.2.1"
+    assert second.do("dns_a", "EXAMPLE.com", lambda: "unused") == "192.0.2.1"
+    assert first.stats()["calls_made"] == 1 and first.stats()["calls_saved"] == 0
+    assert second.stats()["calls_made"] == 0 and second.stats()["calls_saved"] == 1
+    assert flight.stats() == {"calls_made": 1, "calls_saved": 1, "cached_results": 1}
@@ -0,0 +1,29 @@
+from results import ERROR, OK
+from socialengine import SocialLookupEngine
+
+FAST = {platform: {"workers": 1, "calls": 1000, "period": 1} for platform in ("twitter", "reddit")}
+
+class FakeSocial:
+    def __init__(self, twitter_error=None):
+        self.twitter_error = twitter_error
+
+    def search_twitter_users(self, usernames):
+        if self.twitter_error:
+            raise self.twitter_error
+        return {username: {"username": username} for username in usernames if username != "ghost"}
+
+    def search_reddit_user(self, username):
+        raise RuntimeError("reddit down")
+
+def test_twitter_batch_error_becomes_per_user_results():
+    engine = SocialLookupEngine(FakeSocial(twitter_error=RuntimeError("boom")), limits=FAST)
+    results = engine.lookup_many(["jack", "spez"], platforms=("twitter",))
+    assert set(results) == {"jack", "spez"}
+    assert all(found["twitter"].status == ERROR for found in results.values())
+
+def test_missing_twitter_user_and_failing_platform():
+    engine = SocialLookupEngine(FakeSocial(), limits=FAST)
+    results = engine.lookup_many(["jack", "ghost"], platforms=("twitter", "reddit"))
+    assert results["jack"]["twitter"].status == OK
+    assert results["ghost"]["twitter"].error == "User not found."
+    assert results["jack"]["reddit"].status == ERROR
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from webscrapperupdate import BloomFilter, WebCrawler
+
+class FakeResponse:
+    def __init__(self, status, text=""):
+        self.status = status
+        self._text = text
+
+    async def text(self, errors="strict"):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    def __init__(self, status, text=""):
+        self.status = status
+        self.text = text
+
+    def get(self, url):
+        return FakeResponse(self.status, self.text)
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    assert bloom.add("https://example.com/a")
+    assert not bloom.add("https://example.com/a")
+    assert "https://example.com/a" in bloom
+    assert bloom.count == 1
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"https://example.com/page/{i}")
+    false_positives = sum(f"https://example.org/other/{i}" in bloom for i in range(5000))
+    assert false_positives / 5000 < 0.03
+
+@pytest.mark.parametrize("status,allowed", [(401, False), (403, False), (404, True), (500, True)])
+def test_robots_error_statuses(status, allowed):
+    crawler = WebCrawler()
+    robots = asyncio.run(crawler._fetch_robots(FakeSession(status), "https://example.com"))
+    assert robots.can_fetch(crawler.user_agent, "https://example.com/page") is allowed
+
+def test_robots_rules_are_parsed():
+    crawler = WebCrawler()
+    session = FakeSession(200, "User-agent: *\nDisallow: /private/\n")
+    robots = asyncio.run(crawler._fetch_robots(session, "https://example.com"))
+    assert not robots.can_fetch(crawler.user_agent, "https://example.com/private/x")
+    assert robots.can_fetch(crawler.user_agent, "https://example.com/public")
+
+def test_worker_errors_are_reported_in_summary(monkeypatch):
+    crawler = WebCrawler()
+
+    async def failing_process(session, url, depth):
+        raise ValueError("bad page")
+    monkeypatch.setattr(crawler, "_process", failing_process)
+    summary = asyncio.run(crawler.run(["https://example.com/"]))
+    assert summary["pages"] == 0
+    assert summary["errors"] == 1
+    assert summary["failed"] == [{"url": "https://example.com/", "error": "Error: bad page"}]
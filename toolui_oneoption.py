@@ -1,11 +1,11 @@
 import streamlit as st
-import asyncio
-from geolocationupdate import GeolocationIPAnalysis
-from domainlookupupdate import DomainLookup
-from emaillookupupdate import EmailLeakSearch
-from usernamelookup import UsernameLookup
-from socialmediaupdate import SocialMediaOSINT
-from corelationsupdate import DataCorrelation
+import json
+import os
+import requests
+
+# The UI is a thin client: investigations run on the API service (python apiserver.py)
+API_URL = os.environ.get("AUTOINTELX_API", "http://127.0.0.1:8080")
+RUN_DEADLINE = 120  # Seconds before remaining lookups are skipped and partial results shown
 
 st.set_page_config(page_title="OSINT Tool", page_icon="🕵️")
 st.title("AutoIntelX")
@@ -27,72 +27,44 @@ if st.button("Run OSINT Analysis"):
         st.warning("Please enter at least one field to start the analysis.")
     else:
         st.write("Starting OSINT Analysis...")
+        params = {"ip": ip, "domain": domain, "email": email, "username": username, "deadline": RUN_DEADLINE}
+        try:
+            response = requests.post(f"{API_URL}/jobs", json=params, timeout=10)
+            job = response.json()
+        except (requests.RequestException, ValueError) as e:
+            st.error(f"Could not reach the AutoIntelX API at {API_URL}: {e}")
+            st.stop()
+        if response.status_code != 202:
+            st.error(job.get("error", f"Error: {response.status_code}"))
+            st.stop()
 
-        # Initialize tools
-        geo_tool = GeolocationIPAnalysis()
-        domain_tool = DomainLookup()
-        email_tool = EmailLeakSearch()
-        username_tool = UsernameLookup()
-        social_tool = SocialMediaOSINT()
-        correlation_tool = DataCorrelation()
-
+        # Display results as the service streams them back
+        st.subheader("Results:")
+        placeholder = st.empty()
         results = {}
+        summary = {}
+        try:
+            with requests.get(f"{API_URL}/jobs/{job['job_id']}/stream", stream=True,
+                              timeout=(10, RUN_DEADLINE + 30)) as stream:
+                for line in stream.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if "label" in event:
+                        results[event["label"]] = event["result"]
+                        placeholder.json(results)
+                    else:
+                        summary = event
+        except requests.RequestException as e:
+            st.error(f"Lost connection to the AutoIntelX API: {e}")
 
-        # Run Geolocation & IP Analysis
-        if ip:
-            st.write("Running IP Analysis...")
-            results["IP Info"] = geo_tool.get_ip_location(ip)
-            results["ASN Info"] = geo_tool.get_ip_asn(ip)
-            results["Reverse DNS"] = geo_tool.reverse_dns_lookup(ip)
-
-        # Run Domain Lookup
-        if domain:
-            st.write("Running Domain Lookup...")
-            results["Domain IP"] = domain_tool.get_ip(domain)
-            results["WHOIS Info"] = domain_tool.get_whois(domain)
-            results["DNS Records"] = domain_tool.get_dns_records(domain)
-
-        # Run Email Lookup
-        if email:
-            st.write("Running Email Leak Search...")
-            results["Email Breaches"] = email_tool.search_email_breaches(email)
-            results["Email Sources"] = email_tool.search_email_sources(email)
-
-        # Run Username Lookup
-        if username:
-            st.write("Running Username Lookup...")
-            results["Username Lookup"] = asyncio.run(username_tool.lookup(username))
-
-            # Run Social Media OSINT
-            st.write("Running Social Media OSINT...")
-            results["Twitter Data"] = social_tool.search_twitter_user(username)
-            results["Reddit Data"] = social_tool.search_reddit_user(username)
-            results["Instagram Data"] = social_tool.search_instagram_user(username)
-            results["LinkedIn Data"] = social_tool.search_linkedin_user(username)
-
-        # Correlate Data if multiple inputs exist
-        if sum(bool(x) for x in [ip, domain, email, username]) > 1:
-            st.write("Correlating Data...")
-            if username:
-                correlation_tool.add_data_point(username, {"email": email, "ip": ip})
-            if email:
-                correlation_tool.add_data_point(email, {"breaches": results.get("Email Breaches"), "sources": results.get("Email Sources")})
-            if ip:
-                correlation_tool.add_data_point(ip, {"asn_info": results.get("ASN Info"), "reverse_dns": results.get("Reverse DNS")})
-            if domain:
-                correlation_tool.add_data_point(domain, {"whois": results.get("WHOIS Info"), "dns_records": results.get("DNS Records")})
-
-            # Add relationships
-            if username and email:
-                correlation_tool.add_relationship(username, email, "email_association")
-            if username and ip:
-                correlation_tool.add_relationship(username, ip, "ip_association")
-            if username and domain:
-                correlation_tool.add_relationship(username, domain, "domain_association")
-
-            results["Anomalies Detected"] = correlation_tool.detect_anomalies()
-
-        # Display Results
-        st.subheader("Results:")
-        st.json(results)
-        st.success("OSINT Analysis Complete!")
+        skipped = [label for label, result in results.items()
+                   if isinstance(result, dict) and result.get("status") == "skipped"]
+        if summary.get("single_flight"):
+            st.caption(f"Duplicate lookups saved: {summary['single_flight']['calls_saved']}")
+        if skipped:
+            st.warning(f"{len(skipped)} lookups were skipped: " + ", ".join(skipped))
+        if summary.get("status") == "done":
+            st.success("OSINT Analysis Complete!")
+        elif summary:
+            st.error(summary.get("error") or f"Analysis {summary.get('status')}.")
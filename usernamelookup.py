@@ -1,22 +1,55 @@
 import asyncio
+import time
 import aiohttp
+from singleflight import SingleFlight
+from profileclassifier import ProfileClassifier, site_for
+from results import lookup_result
+from resilience import get_resilience, ProviderSkipped
 
 class UsernameLookup:
-    def __init__(self, proxy=None, custom_platforms=None):
+    def __init__(self, proxy=None, custom_platforms=None, flight=None, proxy_pool=None, resilience=None):
         self.proxy = {"http": proxy, "https": proxy} if proxy else None
         self.custom_platforms = custom_platforms if custom_platforms else {}
+        self.flight = flight if flight else SingleFlight()
+        self.proxy_pool = proxy_pool
+        self.resilience = resilience if resilience else get_resilience()
+        self.classifier = ProfileClassifier()
 
     async def check_username(self, session, platform, url):
         """Helper function to check username availability asynchronously."""
+        status = await self.flight.do_async("profile", url, self._fetch_profile, session, url)
+        return platform, status
+
+    def _proxy_for(self, url):
+        """Pick the proxy for a URL: from the pool if one is set, else by URL scheme."""
+        if self.proxy_pool:
+            return self.proxy_pool.choose(url)
+        if self.proxy:
+            return self.proxy["https"] if url.startswith("https") else self.proxy["http"]
+        return None
+
+    async def _fetch_profile(self, session, url):
+        provider = f"profile:{site_for(url)}"
+        try:
+            self.resilience.check(provider)
+        except ProviderSkipped as e:
+            return str(e)
+        proxy = self._proxy_for(url)
+        timeout = aiohttp.ClientTimeout(total=self.resilience.deadline.timeout(self.resilience.timeout))
+        start = time.monotonic()
         try:
-            async with session.get(url, proxy=self.proxy["http"] if self.proxy else None) as response:
-                if response.status == 200:
-                    return platform, "Profile found"
-                else:
-                    return platform, "Profile not found"
+            async with session.get(url, proxy=proxy, timeout=timeout) as response:
+                self.resilience.record(provider, response.status < 500, time.monotonic() - start)
+                if self.proxy_pool:
+                    self.proxy_pool.record(proxy, response.status not in (407, 429), time.monotonic() - start)
+                return await self.classifier.classify_async(url, response)
         except Exception as e:
-            return platform, f"Error: {e}"
+            self.resilience.record(provider, False)
+            if self.proxy_pool:
+                self.proxy_pool.record(proxy, False)
+            return f"Error: {e}"
 
+    @lookup_result("username_scan", "lookup")
     async def lookup(self, username):
         """Search for a username across 300+ platforms asynchronously, including custom ones."""
         platforms = {
@@ -1,48 +1,69 @@
 import requests
 import json
+import time
+import asyncio
+import codecs
+import hashlib
+import math
+import re
+import aiohttp
 import praw
 import tweepy
 import instaloader
-import configparser
-from bs4 import BeautifulSoup
+from singleflight import SingleFlight
+from profileclassifier import ProfileClassifier, site_for
+from credentials import get_credentials
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+from results import lookup_result
+from resilience import get_resilience, ProviderSkipped, DEFAULT_TIMEOUT
 
 class SocialMediaOSINT:
-    def __init__(self, config_file="config.ini"):
+    def __init__(self, config_file="config.ini", flight=None, credentials=None, proxy_pool=None, resilience=None):
         self.twitter_api = None
         self.reddit_api = None
-        self.instaloader = instaloader.Instaloader()
+        self.instaloader = instaloader.Instaloader(request_timeout=DEFAULT_TIMEOUT)
         self.proxy = None
+        self.flight = flight if flight else SingleFlight()
+        self.proxy_pool = proxy_pool
+        self.resilience = resilience if resilience else get_resilience()
+        self.classifier = ProfileClassifier()
         
-        config = configparser.ConfigParser()
-        config.read(config_file)
+        self.credentials = credentials if credentials else get_credentials(config_file)
+        proxy = self.credentials.section("Proxy")
+        twitter = self.credentials.section("Twitter")
+        reddit = self.credentials.section("Reddit")
         
         # Load proxy settings
-        if "Proxy" in config:
+        if proxy:
             self.proxy = {
-                "http": config.get("Proxy", "http", fallback=None),
-                "https": config.get("Proxy", "https", fallback=None)
+                "http": proxy.get("http"),
+                "https": proxy.get("https")
             }
         
         # Load Twitter API keys
-        if "Twitter" in config:
-            auth = tweepy.OAuthHandler(config["Twitter"]["api_key"], config["Twitter"]["api_secret"])
-            auth.set_access_token(config["Twitter"]["access_token"], config["Twitter"]["access_secret"])
-            self.twitter_api = tweepy.API(auth)
+        if twitter:
+            auth = tweepy.OAuthHandler(twitter["api_key"], twitter["api_secret"])
+            auth.set_access_token(twitter["access_token"], twitter["access_secret"])
+            self.twitter_api = tweepy.API(auth, timeout=DEFAULT_TIMEOUT)
         
         # Load Reddit API keys
-        if "Reddit" in config:
+        if reddit:
             self.reddit_api = praw.Reddit(
-                client_id=config["Reddit"]["client_id"],
-                client_secret=config["Reddit"]["client_secret"],
-                user_agent=config["Reddit"]["user_agent"]
+                client_id=reddit["client_id"],
+                client_secret=reddit["client_secret"],
+                user_agent=reddit["user_agent"],
+                timeout=DEFAULT_TIMEOUT
             )
 
+    @lookup_result("twitter", "user")
     def search_twitter_user(self, username):
         """Fetch Twitter user data by username."""
         if not self.twitter_api:
             return "Twitter API not configured."
         try:
-            user = self.twitter_api.get_user(screen_name=username)
+            user = self.resilience.call("twitter", lambda timeout: self.twitter_api.get_user(screen_name=username))
             return {
                 "name": user.name,
                 "username": user.screen_name,
@@ -51,27 +72,37 @@ class SocialMediaOSINT:
                 "following": user.friends_count,
                 "tweets": user.statuses_count
             }
-        except tweepy.TweepError as e:
+        except ProviderSkipped as e:
+            return str(e)
+        except tweepy.TweepyException as e:
             return f"Error: {e}"
 
+    @lookup_result("reddit", "user")
     def search_reddit_user(self, username):
         """Fetch Reddit user data by username."""
         if not self.reddit_api:
             return "Reddit API not configured."
         try:
-            user = self.reddit_api.redditor(username)
-            return {
-                "name": user.name,
-                "karma": user.link_karma + user.comment_karma,
-                "created_utc": user.created_utc
-            }
+            return self.resilience.call("reddit", lambda timeout: self._reddit_user_data(username))
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Error: {e}"
 
+    def _reddit_user_data(self, username):
+        user = self.reddit_api.redditor(username)
+        return {
+            "name": user.name,
+            "karma": user.link_karma + user.comment_karma,
+            "created_utc": user.created_utc
+        }
+
+    @lookup_result("instagram", "user")
     def search_instagram_user(self, username):
         """Fetch Instagram user data by username."""
         try:
-            profile = instaloader.Profile.from_username(self.instaloader.context, username)
+            profile = self.resilience.call("instagram", lambda timeout: instaloader.Profile.from_username(
+                self.instaloader.context, username))
             return {
                 "name": profile.full_name,
                 "bio": profile.biography,
@@ -79,22 +110,35 @@ class SocialMediaOSINT:
                 "following": profile.followees,
                 "posts": profile.mediacount
             }
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
             return f"Error: {e}"
 
+    @lookup_result("linkedin", "user")
     def search_linkedin_user(self, username):
         """Fetch LinkedIn user data by username (public profiles only)."""
+        url = f"https://www.linkedin.com/in/{username}/"
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        proxies = self.proxy_pool.requests_proxies(url) if self.proxy_pool else self.proxy
+        proxy = proxies["https"] if proxies else None
         try:
-            url = f"https://www.linkedin.com/in/{username}/"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers, proxies=self.proxy)
-            if response.status_code == 200:
+            response = self.resilience.call("linkedin", lambda timeout: requests.get(
+                url, headers=headers, proxies=proxies, stream=True, timeout=timeout))
+            if self.proxy_pool:
+                self.proxy_pool.record(proxy, response.status_code not in (407, 429), response.elapsed.total_seconds())
+            if self.classifier.classify(url, response) == "Profile found":
                 return {"profile_url": url, "status": "Profile found (public)"}
             else:
                 return {"profile_url": url, "status": "Profile not accessible"}
+        except ProviderSkipped as e:
+            return str(e)
         except Exception as e:
+            if self.proxy_pool:
+                self.proxy_pool.record(proxy, False)
             return f"Error: {e}"
 
+    @lookup_result("username_scan", "lookup")
     def username_lookup(self, username):
         """Search for a username across multiple platforms."""
         platforms = {
@@ -108,17 +152,291 @@ class SocialMediaOSINT:
             "YouTube": f"https://www.youtube.com/{username}"
         }
         results = {}
-        headers = {'User-Agent': 'Mozilla/5.0'}
         for platform, url in platforms.items():
+            results[platform] = self.flight.do("profile", url, self._fetch_profile, url)
+        return results
+
+    def _fetch_profile(self, url):
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        proxies = self.proxy_pool.requests_proxies(url) if self.proxy_pool else self.proxy
+        proxy = proxies["https"] if proxies else None
+        start = time.monotonic()
+        try:
+            response = self.resilience.call(f"profile:{site_for(url)}", lambda timeout: requests.get(
+                url, headers=headers, proxies=proxies, stream=True, timeout=timeout))
+            if self.proxy_pool:
+                self.proxy_pool.record(proxy, response.status_code not in (407, 429), time.monotonic() - start)
+            return self.classifier.classify(url, response)
+        except ProviderSkipped as e:
+            return str(e)
+        except Exception as e:
+            if self.proxy_pool:
+                self.proxy_pool.record(proxy, False)
+            return f"Error: {e}"
+
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*\.[a-zA-Z]{2,}")
+HANDLE_PATTERN = re.compile(r"(?<![\w.@])@([A-Za-z0-9_]{3,30})\b")
+PROFILE_HOSTS = {"twitter.com", "x.com", "github.com", "instagram.com", "tiktok.com", "medium.com", "reddit.com"}
+
+class BloomFilter:
+    """Fixed-size probabilistic set for visited URLs.
+
+    A million URLs at a 0.1% false-positive rate take under 2 MB, instead of the
+    hundreds of MB a set of URL strings would need. A false positive only means
+    a page is skipped, never that one is fetched twice.
+    """
+    def __init__(self, capacity=1_000_000, error_rate=0.001):
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        """Add an item; return True if it was (probably) not already present."""
+        new = False
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, item):
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(item))
+
+class PageExtractor(HTMLParser):
+    """Incremental HTML parser that collects links, emails and usernames as bytes arrive."""
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links = set()
+        self.emails = set()
+        self.usernames = set()
+        self._skip = 0
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag in ("script", "style"):
+            self._skip += 1
+        if tag in ("a", "link", "area"):
+            href = dict(attrs).get("href")
+            if href:
+                self._add_link(href)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        # Text can arrive split across chunks, so scan it once the next tag starts
+        if not self._skip:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush_text()
+
+    def _flush_text(self):
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text = []
+        self.emails.update(email.lower() for email in EMAIL_PATTERN.findall(text))
+        self.usernames.update(HANDLE_PATTERN.findall(text))
+
+    def _add_link(self, href):
+        if href.startswith("mailto:"):
+            email = href[7:].split("?", 1)[0]
+            if EMAIL_PATTERN.fullmatch(email):
+                self.emails.add(email.lower())
+            return
+        url, _ = urldefrag(urljoin(self.base_url, href))
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return
+        self.links.add(url)
+        host = (parts.hostname or "").removeprefix("www.")
+        segments = [s for s in parts.path.split("/") if s]
+        if host in PROFILE_HOSTS and len(segments) == 1:
+            self.usernames.add(segments[0].lstrip("@"))
+
+class WebCrawler:
+    """Asynchronous crawler feeding extracted emails, usernames and links into DataCorrelation.
+
+    URLs wait on a frontier and are fetched by a pool of workers. Each host has
+    its own concurrency limit and delay, and its robots.txt is fetched once and
+    honoured. Visited URLs are kept in a Bloom filter, and pages are parsed
+    incrementally as they download. Pages that fail are listed in self.errors
+    and counted in the run() summary.
+    """
+    def __init__(self, correlation=None, max_pages=1000, max_depth=2, concurrency=20,
+                 per_host_concurrency=2, per_host_delay=1.0, same_host_only=True,
+                 max_page_bytes=2 * 1024 * 1024, user_agent="AutoIntelX-Crawler", flight=None):
+        self.correlation = correlation
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.same_host_only = same_host_only
+        self.max_page_bytes = max_page_bytes
+        self.user_agent = user_agent
+        self.flight = flight if flight else SingleFlight()
+        self.visited = BloomFilter(capacity=max(max_pages * 20, 1000))
+        self.errors = []
+
+    async def crawl(self, seeds):
+        """Crawl from seed URLs, yielding one result dict per fetched page."""
+        self._queued = 0
+        self._seed_hosts = {urlsplit(seed).hostname for seed in seeds}
+        self._host_slots = {}
+        self.errors = []
+        frontier = asyncio.Queue()
+        pages = asyncio.Queue()
+        for seed in seeds:
+            self._enqueue(frontier, seed, 0)
+
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(headers={"User-Agent": self.user_agent}, timeout=timeout) as session:
+            workers = [asyncio.create_task(self._worker(session, frontier, pages)) for _ in range(self.concurrency)]
+            finished = asyncio.create_task(frontier.join())
+            try:
+                while True:
+                    next_page = asyncio.create_task(pages.get())
+                    done, _ = await asyncio.wait({next_page, finished}, return_when=asyncio.FIRST_COMPLETED)
+                    if next_page in done:
+                        yield next_page.result()
+                        continue
+                    next_page.cancel()
+                    while not pages.empty():
+                        yield pages.get_nowait()
+                    break
+            finally:
+                finished.cancel()
+                for worker in workers:
+                    worker.cancel()
+
+    async def run(self, seeds):
+        """Crawl to completion and return a summary of everything found."""
+        summary = {"pages": 0, "emails": set(), "usernames": set()}
+        async for page in self.crawl(seeds):
+            summary["pages"] += 1
+            summary["emails"].update(page["emails"])
+            summary["usernames"].update(page["usernames"])
+        summary["emails"] = sorted(summary["emails"])
+        summary["usernames"] = sorted(summary["usernames"])
+        summary["errors"] = len(self.errors)
+        summary["failed"] = self.errors
+        return summary
+
+    def _enqueue(self, frontier, url, depth):
+        url, _ = urldefrag(url)
+        if self._queued >= self.max_pages or depth > self.max_depth:
+            return False
+        if not self._in_scope(url):
+            return False
+        if not self.visited.add(url):
+            return False
+        self._queued += 1
+        frontier.put_nowait((url, depth))
+        return True
+
+    def _in_scope(self, url):
+        return not self.same_host_only or urlsplit(url).hostname in self._seed_hosts
+
+    async def _worker(self, session, frontier, pages):
+        while True:
+            url, depth = await frontier.get()
             try:
-                response = requests.get(url, headers=headers, proxies=self.proxy)
-                if response.status_code == 200:
-                    results[platform] = "Profile found"
-                else:
-                    results[platform] = "Profile not found"
+                page = await self._process(session, url, depth)
+                if page is not None:
+                    for link in page["links"]:
+                        self._enqueue(frontier, link, depth + 1)
+                        if self.correlation and self._in_scope(link):
+                            self.correlation.add_relationship(url, link, "links_to")
+                    self._correlate(page)
+                    await pages.put(page)
             except Exception as e:
-                results[platform] = f"Error: {e}"
-        return results
+                self.errors.append({"url": url, "error": f"Error: {e}"})
+            finally:
+                frontier.task_done()
+
+    async def _process(self, session, url, depth):
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        robots = await self.flight.do_async("robots", origin, self._fetch_robots, session, origin)
+        if robots is not None and not robots.can_fetch(self.user_agent, url):
+            return None
+
+        host = parts.hostname
+        if host not in self._host_slots:
+            delay = robots.crawl_delay(self.user_agent) if robots is not None else None
+            self._host_slots[host] = [asyncio.Semaphore(self.per_host_concurrency),
+                                      max(delay or 0, self.per_host_delay), 0.0]
+        semaphore, delay, _ = self._host_slots[host]
+
+        async with semaphore:
+            now = time.monotonic()
+            slot = max(now, self._host_slots[host][2])
+            self._host_slots[host][2] = slot + delay
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            async with session.get(url) as response:
+                if response.status != 200 or "html" not in response.headers.get("Content-Type", ""):
+                    return None
+                extractor = PageExtractor(str(response.url))
+                decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+                read = 0
+                async for chunk in response.content.iter_chunked(16384):
+                    extractor.feed(decoder.decode(chunk))
+                    read += len(chunk)
+                    if read >= self.max_page_bytes:
+                        break
+                extractor.close()
+
+        return {
+            "url": url,
+            "depth": depth,
+            "emails": sorted(extractor.emails),
+            "usernames": sorted(extractor.usernames),
+            "links": sorted(extractor.links)
+        }
+
+    async def _fetch_robots(self, session, origin):
+        parser = RobotFileParser()
+        try:
+            async with session.get(f"{origin}/robots.txt") as response:
+                if response.status in (401, 403):
+                    parser.disallow_all = True
+                    return parser
+                if response.status >= 400:
+                    parser.allow_all = True
+                    return parser
+                parser.parse((await response.text(errors="replace")).splitlines())
+                return parser
+        except Exception:
+            return None
+
+    def _correlate(self, page):
+        if not self.correlation:
+            return
+        self.correlation.add_data_point(page["url"], {"type": "page", "depth": page["depth"]})
+        for email in page["emails"]:
+            self.correlation.add_data_point(email, {"type": "email"})
+            self.correlation.add_relationship(page["url"], email, "mentions_email")
+        for username in page["usernames"]:
+            self.correlation.add_data_point(username, {"type": "username"})
+            self.correlation.add_relationship(page["url"], username, "mentions_username")
 
 # Example Usage
 if __name__ == "__main__":
@@ -128,3 +446,6 @@ if __name__ == "__main__":
     print(sm_osint.search_instagram_user("instagram"))
     print(sm_osint.search_linkedin_user("linkedin_username"))
     print(sm_osint.username_lookup("jack"))
+
+    crawler = WebCrawler(max_pages=50, max_depth=1)
+    print(asyncio.run(crawler.run(["https://example.com/"])))